@@ -1,57 +1,100 @@
 """
-Utilidad para firmar URLs de Bunny CDN con Token Authentication.
+Firma de URLs de Bunny CDN con Token Authentication.
 
 Bunny.net usa el siguiente formato para URLs firmadas:
 https://{hostname}/{path}?token={token}&expires={expires}
 
-Donde token = md5(security_key + path + expires)
+Donde token = SHA256(security_key + path + expires)
 en formato URL-safe Base64.
 
+La expiración se alinea a bloques de tiempo: la misma imagen genera la
+MISMA URL durante todo el bloque, así Bunny CDN y el navegador la cachean,
+y las URLs ya firmadas se reutilizan desde una caché LRU en memoria.
+
 Ref: https://docs.bunny.net/docs/cdn-token-authentication
 """
 
 import hashlib
-import base64
 import time
+from base64 import urlsafe_b64encode
 from urllib.parse import urlparse
+
 from django.conf import settings
 
+from . import metrics
+from .lru import LRUCache
+
+# (token_key, url, expires) -> URL firmada; la llave incluye el bloque,
+# así que las entradas de bloques anteriores solo salen por LRU.
+_signed_urls = LRUCache(maxsize=getattr(settings, "BUNNY_SIGNED_URL_CACHE_SIZE", 8192))
+
+
+def signing_block(expiration_seconds):
+    """
+    Duración en segundos del bloque de firma para ``expiration_seconds``.
+
+    Es la mitad de la expiración, entre 1 minuto y 1 hora: una URL firmada
+    al inicio de un bloque sigue vigente al menos ``expiration_seconds``.
+    """
+    return max(60, min(3600, expiration_seconds // 2))
+
+
+def block_expires(expiration_seconds, now=None):
+    """``expires`` alineado al bloque actual (igual para todo el bloque)."""
+    block = signing_block(expiration_seconds)
+    now = int(time.time()) if now is None else int(now)
+    return (now // block + 1) * block + expiration_seconds
+
+
+def make_token(token_key, path, expires):
+    """Token URL-safe Base64 (sin ``=``) de SHA256(token_key + path + expires)."""
+    digest = hashlib.sha256(f"{token_key}{path}{expires}".encode("utf-8")).digest()
+    return urlsafe_b64encode(digest).decode("ascii").rstrip("=")
+
+
+def sign_url(url, *, token_key, expiration_seconds):
+    """
+    Firma ``url`` con expiración alineada al bloque actual.
+
+    Args:
+        url: URL completa del recurso, sin query string.
+        token_key: Llave de Token Authentication de la zona.
+        expiration_seconds: Validez mínima del token en segundos.
+
+    Returns:
+        URL firmada con token y expires (la misma durante todo el bloque).
+    """
+    if not token_key:
+        return url
+
+    expires = block_expires(expiration_seconds)
+    key = (token_key, url, expires)
+    signed = _signed_urls.get(key)
+    if signed is not None:
+        metrics.incr("signed_url.hit")
+        return signed
+    metrics.incr("signed_url.miss")
+
+    token = make_token(token_key, urlparse(url).path, expires)
+    signed = f"{url}?token={token}&expires={expires}"
+    _signed_urls.set(key, signed)
+    return signed
+
 
 def sign_bunny_url(url: str, expiration_seconds: int = 3600) -> str:
     """
-    Firma una URL de Bunny CDN con token authentication.
+    Firma una URL de Bunny CDN con la llave de ``BUNNY_TOKEN_KEY``.
 
     Args:
         url: URL completa del recurso (ej: https://tripsdjangoapp.b-cdn.net/imagen.jpg)
         expiration_seconds: Tiempo de validez del token en segundos (default: 1 hora)
 
     Returns:
-        URL firmada con token y expires
+        URL firmada con token y expires, o la misma URL si no hay token key.
     """
-    token_key = getattr(settings, "BUNNY_TOKEN_KEY", "")
-    if not token_key:
-        return url  # Sin token key, devolver URL sin firmar
-
-    # Separar hostname y path
     parsed = urlparse(url)
-    path = parsed.path
-
-    # Calcular expiración redondeada a bloques de 1h
-    # Así la misma imagen genera la MISMA URL durante 1h,
-    # permitiendo que Bunny CDN y el navegador la cacheen.
-    block = 3600  # 1 hora
-    now = int(time.time())
-    expires = now + expiration_seconds
-    expires = expires - (expires % block) + block
-
-    # Generar token: md5(security_key + path + expires)
-    hashable = f"{token_key}{path}{expires}"
-    token_digest = hashlib.md5(hashable.encode("utf-8")).digest()
-    token = base64.b64encode(token_digest).decode("utf-8")
-
-    # URL-safe: reemplazar +, / y quitar =
-    token = token.replace("\n", "").replace("+", "-").replace("/", "_").replace("=", "")
-
-    # Reconstruir URL con query params
-    signed_url = f"{parsed.scheme}://{parsed.netloc}{path}?token={token}&expires={expires}"
-    return signed_url
+    return sign_url(
+        f"{parsed.scheme}://{parsed.netloc}{parsed.path}",
+        token_key=getattr(settings, "BUNNY_TOKEN_KEY", ""),
+        expiration_seconds=expiration_seconds,
+    )
@@ -0,0 +1,182 @@
+"""
+Versiones de caché por nombre lógico (p. ej. ``"inventoryitem.42"``).
+
+Las llaves de lo cacheado incluyen la versión actual; al modificar los
+datos se incrementa la versión y las entradas anteriores dejan de leerse
+(expiran solas). Las versiones viven en la caché de Django, así que con un
+backend compartido (Redis/Memcached) todos los procesos ven el cambio.
+``get_or_compute`` agrega protección contra estampidas: ante un fallo
+concurrente solo un proceso recalcula y los demás esperan su resultado.
+
+Todo esto supone un backend compartido y en memoria (Redis/Memcached): con
+uno local al proceso cada worker tendría sus propias versiones y vería
+valores viejos, y con la caché en BD cada lectura de versión sería una
+consulta SQL más. Con cualquier otro backend ``versioned_cache_enabled()``
+es falso y las cachés versionadas se desactivan (se calcula siempre), salvo
+que ``VERSIONED_CACHE`` lo fuerce. ``check_shared_cache`` lo avisa.
+"""
+import time
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache
+from django.db import transaction
+
+from .bunny import signing_block
+
+VERSION_TTL = None  # las versiones no expiran
+
+SHARED_BACKENDS = (
+    "django.core.cache.backends.redis.RedisCache",
+    "django.core.cache.backends.memcached.PyMemcacheCache",
+    "django.core.cache.backends.memcached.PyLibMCCache",
+    "django_redis.cache.RedisCache",
+)
+
+_MISSING = object()
+
+
+def versioned_cache_enabled():
+    """
+    Indica si se usan las cachés versionadas (filas, estadísticas).
+
+    ``VERSIONED_CACHE`` en settings lo fija explícitamente; si es ``None``
+    se activan solo con un backend compartido en memoria (Redis/Memcached).
+    """
+    forced = getattr(settings, "VERSIONED_CACHE", None)
+    if forced is not None:
+        return forced
+    return settings.CACHES.get("default", {}).get("BACKEND") in SHARED_BACKENDS
+
+
+@checks.register(checks.Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Avisa en ``check --deploy`` si las cachés versionadas quedan desactivadas."""
+    if versioned_cache_enabled():
+        return []
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    return [
+        checks.Warning(
+            f"La caché por defecto ({backend.rsplit('.', 1)[-1]}) no es Redis ni Memcached.",
+            hint=(
+                "La caché de filas del inventario y de estadísticas del dashboard "
+                "queda desactivada. Configure CACHE_URL=redis://..."
+            ),
+            id="common.W001",
+        )
+    ]
+
+
+def _version_key(name):
+    return f"cache:version:{name}"
+
+
+def instance_version_name(model_name, pk):
+    """Nombre de versión de un registro, p. ej. ``"inventoryitem.42"``."""
+    return f"{model_name}.{pk}"
+
+
+def get_version(name):
+    """Versión actual de ``name`` (la crea en 1 si no existe)."""
+    key = _version_key(name)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, VERSION_TTL)
+        version = cache.get(key, 1)
+    return version
+
+
+def get_versions(names):
+    """
+    ``{name: versión}`` de varios nombres en una sola lectura de la caché.
+
+    Los que aún no existen valen 1, igual que con ``get_version``; el primer
+    ``bump_version`` los crea en 2.
+    """
+    keys = {_version_key(name): name for name in names}
+    found = cache.get_many(keys)
+    return {name: found.get(key, 1) for key, name in keys.items()}
+
+
+def signed_url_bucket():
+    """
+    Bloque de tiempo actual para cachear HTML/URLs con firmas de Bunny.
+
+    Coincide con el bloque de firma de ``apps.common.bunny``: durante un
+    bucket las URLs firmadas no cambian y siguen vigentes mientras se sirvan.
+    """
+    expiration = getattr(settings, "BUNNY_TOKEN_EXPIRATION", None)
+    block = signing_block(expiration) if expiration else 3600
+    return int(time.time()) // block
+
+
+def bump_version(name):
+    """Invalida todo lo cacheado bajo ``name`` incrementando su versión."""
+    if not versioned_cache_enabled():
+        return None
+    key = _version_key(name)
+    try:
+        return cache.incr(key)
+    except ValueError:  # la llave no existía
+        cache.add(key, 2, VERSION_TTL)
+        return cache.get(key, 2)
+
+
+def bump_version_on_commit(name, *, using=None):
+    """
+    Incrementa la versión de ``name`` cuando la transacción actual confirme.
+
+    Así ningún proceso recalcula con datos aún no confirmados bajo la versión
+    nueva. Fuera de una transacción se incrementa de inmediato.
+    """
+    if not versioned_cache_enabled():
+        return
+    transaction.on_commit(lambda: bump_version(name), using=using)
+
+
+def get_or_compute(key, compute, *, versions=(), timeout=300, lock_timeout=10, poll=0.05):
+    """
+    Devuelve ``compute()`` cacheado bajo ``key`` y las versiones de ``versions``.
+
+    Si falta en caché, el primero que obtiene el candado (``cache.add``)
+    recalcula y guarda; los demás sondean cada ``poll`` segundos hasta
+    ``lock_timeout`` y, si el valor no aparece, calculan por su cuenta.
+
+    Args:
+        key: Llave base del valor.
+        compute: Función sin argumentos que produce el valor.
+        versions: Nombres cuya versión forma parte de la llave.
+        timeout: Segundos de vida del valor en caché.
+        lock_timeout: Segundos máximos que se espera a otro proceso.
+        poll: Intervalo de sondeo mientras se espera.
+
+    Sin caché compartida (``versioned_cache_enabled()`` falso) solo calcula:
+    ni las versiones ni el candado servirían entre procesos.
+    """
+    if not versioned_cache_enabled():
+        return compute()
+
+    current = get_versions(versions)
+    suffix = ":".join(f"{name}.{current[name]}" for name in versions)
+    full_key = f"{key}:{suffix}" if suffix else key
+
+    value = cache.get(full_key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    lock_key = f"{full_key}:lock"
+    if cache.add(lock_key, 1, lock_timeout):
+        try:
+            value = compute()
+            cache.set(full_key, value, timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        time.sleep(poll)
+        value = cache.get(full_key, _MISSING)
+        if value is not _MISSING:
+            return value
+    return compute()
@@ -0,0 +1,69 @@
+"""
+Caché LRU en memoria del proceso, con expiración opcional por entrada.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Diccionario acotado a ``maxsize`` entradas que descarta la menos usada.
+
+    Cada entrada expira ``ttl`` segundos después de guardarse (``None`` = no
+    expira). Es seguro entre hilos. Al vivir en un solo proceso, los demás
+    workers no ven las invalidaciones: el ``ttl`` acota cuánto puede durar
+    un valor viejo ahí.
+
+    Args:
+        maxsize: Número máximo de entradas.
+        ttl: Segundos de vida de cada entrada.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[1]
+
+    def evict(self, predicate):
+        """Elimina las entradas para las que ``predicate(key, value)`` es verdadero."""
+        with self._lock:
+            stale = [k for k, (_, v) in self._data.items() if predicate(k, v)]
+            for key in stale:
+                del self._data[key]
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
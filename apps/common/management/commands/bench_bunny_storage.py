@@ -0,0 +1,196 @@
+import statistics
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from django.core.files.base import ContentFile, File
+from django.core.management.base import BaseCommand
+
+from apps.common.storage import BunnyStorage
+
+
+class FakeBunnyHandler(BaseHTTPRequestHandler):
+    """Storage API mínima en memoria: PUT/GET/HEAD/DELETE por path."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # sin el retardo de ACK entre headers y cuerpo
+    objects = {}
+    handshake_delay = 0.0
+    fail_next = 0  # responder 503 a las siguientes N peticiones idempotentes
+    lock = threading.Lock()
+
+    def setup(self):
+        # Simula el costo de TCP + TLS de cada conexión nueva
+        time.sleep(self.handshake_delay)
+        super().setup()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body=b"", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _flaky(self):
+        with self.lock:
+            if FakeBunnyHandler.fail_next > 0:
+                FakeBunnyHandler.fail_next -= 1
+                return True
+        return False
+
+    def do_PUT(self):
+        length = int(self.headers.get("Content-Length", 0))
+        if self.path.endswith(".discard"):
+            # Subidas grandes del benchmark de memoria: leer y descartar
+            while length > 0:
+                length -= len(self.rfile.read(min(length, 64 * 1024)))
+        else:
+            self.objects[self.path] = self.rfile.read(length)
+        self._reply(201, b'{"HttpCode":201}')
+
+    def do_GET(self):
+        if self._flaky():
+            return self._reply(503)
+        data = self.objects.get(self.path)
+        self._reply(200, data) if data is not None else self._reply(404)
+
+    def do_HEAD(self):
+        if self._flaky():
+            return self._reply(503)
+        data = self.objects.get(self.path)
+        if data is None:
+            return self._reply(404)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+
+    def do_DELETE(self):
+        existed = self.objects.pop(self.path, None) is not None
+        self._reply(200 if existed else 404)
+
+
+def _legacy_ops(storage_url, name, payload):
+    """Operaciones como antes: requests.* de módulo, conexión nueva cada vez."""
+    url = f"{storage_url}{name}"
+    headers = {"AccessKey": "bench"}
+    return {
+        "put": lambda: requests.put(url, headers=headers, data=payload, timeout=30),
+        "head": lambda: requests.head(url, headers=headers, timeout=5),
+        "get": lambda: requests.get(url, headers=headers, timeout=30).content,
+        "delete": lambda: requests.delete(url, headers=headers, timeout=15),
+    }
+
+
+def _read(storage, name):
+    with storage.open(name) as f:
+        return f.read()
+
+
+def _head(storage, name):
+    # Sin la caché de metadatos: medir el HEAD real, no un acierto del LRU
+    storage.metadata_cache.pop(name)
+    return storage.exists(name)
+
+
+def _pooled_ops(storage, name, payload):
+    return {
+        "put": lambda: storage._save(name, ContentFile(payload)),
+        "head": lambda: _head(storage, name),
+        "get": lambda: _read(storage, name),
+        "delete": lambda: storage.delete(name),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara la latencia por operación de BunnyStorage (Session con pool y "
+        "reintentos) contra llamadas requests.* sin pool, usando un servidor "
+        "Bunny falso local. No toca Bunny.net."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200, help="Repeticiones por operación (default: 200).")
+        parser.add_argument("--size", type=int, default=64 * 1024, help="Tamaño del archivo en bytes (default: 65536).")
+        parser.add_argument(
+            "--upload-mb", type=str, default="1,16,64",
+            help="Tamaños (MB) para medir memoria pico de _save (default: 1,16,64).",
+        )
+        parser.add_argument(
+            "--handshake-ms", type=float, default=20.0,
+            help="Retardo simulado por conexión nueva, TCP+TLS (default: 20).",
+        )
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        payload = b"x" * options["size"]
+        FakeBunnyHandler.handshake_delay = options["handshake_ms"] / 1000
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBunnyHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        storage_url = f"http://127.0.0.1:{server.server_address[1]}/bench/"
+
+        storage = BunnyStorage()
+        storage.storage_url = storage_url
+        storage.token_key = ""
+
+        try:
+            self.stdout.write(
+                f"{iterations} iteraciones, {len(payload)} bytes, "
+                f"handshake simulado {options['handshake_ms']:.0f} ms"
+            )
+            self.stdout.write(f"  {'operación':<8} {'antes ms':>9} {'ahora ms':>9} {'ahorro ms':>10}")
+            legacy = self._run(lambda: _legacy_ops(storage_url, "legacy.bin", payload), iterations)
+            pooled = self._run(lambda: _pooled_ops(storage, "pooled.bin", payload), iterations)
+            for op in ("put", "head", "get", "delete"):
+                before, after = legacy[op], pooled[op]
+                self.stdout.write(f"  {op:<8} {before:>9.2f} {after:>9.2f} {before - after:>10.2f}")
+
+            self.stdout.write("Memoria pico de _save (archivo en disco):")
+            for mb in (int(v) for v in options["upload_mb"].split(",") if v.strip()):
+                peak = self._upload_peak(storage, mb)
+                self.stdout.write(f"  {mb:>5} MB → {peak / 1024:>8.0f} KiB")
+
+            # Reintentos: dos 503 seguidos en un GET se absorben sin error
+            storage._save("retry.bin", ContentFile(payload))
+            FakeBunnyHandler.fail_next = 2
+            ok = len(_read(storage, "retry.bin")) == len(payload)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        if not ok:
+            self.stderr.write(self.style.ERROR("✘ El GET con 503 transitorios falló"))
+            raise SystemExit(1)
+        self.stdout.write(self.style.SUCCESS("✔ GET con 503 transitorios recuperado por reintento"))
+
+    def _run(self, make_ops, iterations):
+        """Mediana en ms de cada operación (put → head → get → delete por ciclo)."""
+        samples = {op: [] for op in ("put", "head", "get", "delete")}
+        ops = make_ops()
+        for _ in range(iterations):
+            for op, fn in ops.items():
+                start = time.perf_counter()
+                fn()
+                samples[op].append((time.perf_counter() - start) * 1000)
+        return {op: statistics.median(values) for op, values in samples.items()}
+
+    def _upload_peak(self, storage, mb):
+        """Memoria pico (bytes, tracemalloc) al subir un archivo de ``mb`` MB."""
+        with tempfile.TemporaryFile() as tmp:
+            block = b"x" * (1 << 20)
+            for _ in range(mb):
+                tmp.write(block)
+            tmp.seek(0)
+            tracemalloc.start()
+            storage._save(f"upload-{mb}.discard", File(tmp))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        return peak
@@ -7,6 +7,9 @@ from django.core.management import call_command
 from django.core.management.base import BaseCommand
 from django.db import connection
 
+from apps.inventory.models import Purchase
+from apps.inventory.services import purchases as purchase_svc
+
 
 DEFAULT_FIXTURE = Path("backup.json")
 
@@ -60,12 +63,22 @@ class Command(BaseCommand):
 
         self.stdout.write(f"Cargando {len(data)} objetos desde {fixture} …")
         call_command("loaddata", str(fixture), verbosity=1)
+        self._rebuild_derived()
 
         # Resetear secuencias de PostgreSQL
         self._reset_sequences()
 
         self.stdout.write(self.style.SUCCESS(f"✔ Seed completado ({len(data)} objetos)"))
 
+    def _rebuild_derived(self):
+        """Recalcula los campos derivados que loaddata no llena."""
+        self.stdout.write("Recalculando totales de compras …")
+        purchase_svc.refresh_totals()
+        self.stdout.write("Reconstruyendo texto de búsqueda de compras …")
+        purchase_svc.refresh_search_text(
+            Purchase.objects.order_by("pk").values_list("pk", flat=True).iterator()
+        )
+
     def _reset_sequences(self):
         """Resetea las secuencias de PostgreSQL para evitar conflictos de IDs."""
         if connection.vendor != "postgresql":
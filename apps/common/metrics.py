@@ -0,0 +1,42 @@
+"""
+Contadores de métricas en memoria del proceso.
+
+Pensados para medir caché (aciertos/fallos) y latencias sin dependencias
+externas. Cada worker lleva sus propios contadores; ``snapshot`` devuelve
+los del proceso que atiende la petición.
+"""
+import threading
+from collections import defaultdict
+
+_counters = defaultdict(int)
+_lock = threading.Lock()
+
+
+def incr(name, value=1):
+    """Suma ``value`` al contador ``name``."""
+    with _lock:
+        _counters[name] += value
+
+
+def hit_rate(prefix):
+    """Proporción ``hit / (hit + miss)`` de ``<prefix>.hit`` / ``<prefix>.miss``."""
+    with _lock:
+        hits = _counters.get(f"{prefix}.hit", 0)
+        misses = _counters.get(f"{prefix}.miss", 0)
+    total = hits + misses
+    return hits / total if total else None
+
+
+def snapshot():
+    """Copia de todos los contadores, más ``<prefix>.hit_rate`` donde aplique."""
+    with _lock:
+        data = dict(_counters)
+    for name in [n for n in data if n.endswith(".hit")]:
+        prefix = name[: -len(".hit")]
+        data[f"{prefix}.hit_rate"] = hit_rate(prefix)
+    return dict(sorted(data.items()))
+
+
+def reset():
+    with _lock:
+        _counters.clear()
@@ -0,0 +1,219 @@
+"""
+Paginadores compartidos para listados grandes.
+"""
+import base64
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+
+class CachedCountPaginator(Paginator):
+    """
+    ``Paginator`` que cachea el total por firma de filtro.
+
+    El ``COUNT(*)`` se guarda en la caché de Django durante
+    ``PAGINATION_COUNT_TTL`` segundos bajo una llave derivada del SQL del
+    queryset, así cambiar de página con HTMX no vuelve a contar. En
+    PostgreSQL, si el estimado del planner supera
+    ``PAGINATION_ESTIMATE_THRESHOLD`` se usa el estimado en lugar del conteo
+    exacto y ``count_is_estimate`` queda en ``True``.
+    """
+
+    count_is_estimate = False
+
+    def __init__(self, object_list, per_page, *, ttl=None, estimate_threshold=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.ttl = ttl if ttl is not None else getattr(settings, "PAGINATION_COUNT_TTL", 60)
+        self.estimate_threshold = (
+            estimate_threshold
+            if estimate_threshold is not None
+            else getattr(settings, "PAGINATION_ESTIMATE_THRESHOLD", 100_000)
+        )
+
+    def _cache_key(self):
+        query = getattr(self.object_list, "query", None)
+        if query is None:
+            return None
+        try:
+            sql, params = query.sql_with_params()
+        except EmptyResultSet:
+            return None
+        signature = f"{self.object_list.db}|{sql}|{params!r}"
+        return "pagination:count:" + hashlib.sha256(signature.encode("utf-8")).hexdigest()
+
+    def _planner_estimate(self):
+        """Filas estimadas por el planner de PostgreSQL (``None`` si no aplica)."""
+        qs = self.object_list
+        connection = connections[qs.db]
+        if connection.vendor != "postgresql":
+            return None
+        try:
+            sql, params = qs.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+        except (EmptyResultSet, DatabaseError) as exc:
+            logger.debug("Sin estimado del planner: %s", exc)
+            return None
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @cached_property
+    def count(self):
+        key = self._cache_key()
+        if key is None:
+            return super().count
+
+        cached = cache.get(key)
+        if cached is not None:
+            count, self.count_is_estimate = cached
+            return count
+
+        estimate = self._planner_estimate()
+        if estimate is not None and estimate > self.estimate_threshold:
+            count, self.count_is_estimate = estimate, True
+        else:
+            count = super().count
+        cache.set(key, (count, self.count_is_estimate), self.ttl)
+        return count
+
+
+class KeysetPage:
+    """Página de resultados obtenida por cursor (sin COUNT ni OFFSET)."""
+
+    def __init__(self, object_list, *, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+class KeysetPaginator:
+    """
+    Paginación por cursor sobre un orden único, p. ej. ``("-happened_at", "-id")``.
+
+    Cada página filtra por ``(a, b) < (cursor)`` sobre un índice en lugar de
+    ``OFFSET``, así la página 5,000 cuesta lo mismo que la primera. El
+    cursor es opaco (JSON en base64 URL-safe) y un cursor inválido se trata
+    como la primera página.
+
+    Args:
+        queryset: QuerySet ya filtrado (se ignora su ``order_by``).
+        per_page: Registros por página.
+        ordering: Campos del orden; el último debe ser único (normalmente ``id``).
+    """
+
+    def __init__(self, queryset, per_page, *, ordering=("-happened_at", "-id")):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self._fields = [
+            (name.lstrip("-"), name.startswith("-")) for name in self.ordering
+        ]
+
+    # -- cursores ----------------------------------------------------------
+
+    def _encode(self, obj):
+        values = []
+        for name, _ in self._fields:
+            value = getattr(obj, name)
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def _decode(self, cursor):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            if not isinstance(values, list) or len(values) != len(self._fields):
+                return None
+            model = self.queryset.model
+            return [
+                model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(self._fields, values)
+            ]
+        except (ValueError, TypeError, ValidationError):
+            return None
+
+    def _after(self, values, *, reverse=False):
+        """
+        Q para las filas posteriores al cursor en el orden (o el inverso).
+
+        Expande ``(a, b) < (x, y)`` a ``a < x OR (a = x AND b < y)`` y le
+        agrega la cota ``a <= x`` sobre la primera columna: sin ella
+        PostgreSQL no convierte el OR en un rango del índice y recorre desde
+        el inicio del orden filtrando fila por fila.
+        """
+        condition = Q()
+        for i, (name, descending) in enumerate(self._fields):
+            lookup = "lt" if descending != reverse else "gt"
+            term = Q(**{f"{name}__{lookup}": values[i]})
+            for j in range(i):
+                term &= Q(**{self._fields[j][0]: values[j]})
+            condition |= term
+        first, descending = self._fields[0]
+        bound = "lte" if descending != reverse else "gte"
+        return Q(**{f"{first}__{bound}": values[0]}) & condition
+
+    # -- API ---------------------------------------------------------------
+
+    def get_page(self, cursor="", direction="next"):
+        """Devuelve la página que sigue (``next``) o precede (``prev``) al cursor."""
+        values = self._decode(cursor) if cursor else None
+        backwards = values is not None and direction == "prev"
+
+        if backwards:
+            inverse = [name[1:] if name.startswith("-") else f"-{name}" for name in self.ordering]
+            qs = self.queryset.filter(self._after(values, reverse=True)).order_by(*inverse)
+        else:
+            qs = self.queryset.order_by(*self.ordering)
+            if values is not None:
+                qs = qs.filter(self._after(values))
+
+        rows = list(qs[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if backwards:
+            rows.reverse()
+
+        if not rows:
+            return KeysetPage([])
+
+        if backwards:
+            next_cursor = self._encode(rows[-1])
+            previous_cursor = self._encode(rows[0]) if has_more else None
+        else:
+            next_cursor = self._encode(rows[-1]) if has_more else None
+            previous_cursor = self._encode(rows[0]) if values is not None else None
+        return KeysetPage(rows, next_cursor=next_cursor, previous_cursor=previous_cursor)
@@ -1,17 +1,212 @@
 import hashlib
+import json
 import logging
+import os
+import tempfile
+import threading
 import time
-from base64 import b64encode
-from urllib.parse import urlparse
+from contextlib import suppress
+from pathlib import Path
 
 import requests
 from django.conf import settings
-from django.core.files.base import ContentFile
+from django.core.files.base import File
 from django.core.files.storage import Storage
 from django.utils.deconstruct import deconstructible
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from . import metrics
+from .bunny import sign_url
+from .lru import LRUCache
 
 logger = logging.getLogger("bunny_storage")
 
+# Timeouts de lectura por operación (segundos); BUNNY_TIMEOUTS los sobrescribe
+DEFAULT_TIMEOUTS = {
+    "upload": 30,
+    "download": 30,
+    "metadata": 5,
+    "delete": 15,
+    "list": 15,
+}
+
+CHUNK_SIZE = 64 * 1024
+# Descargas sin caché en disco: en memoria hasta este tamaño, luego a disco
+SPOOL_MAX_MEMORY = 1024 * 1024
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def _build_session():
+    """
+    Session con keep-alive, pool acotado y reintentos con backoff.
+
+    Solo se reintentan GET/HEAD/DELETE ante errores de conexión y 5xx; el
+    PUT no, porque el cuerpo de la subida no siempre se puede reenviar.
+    """
+    retry = Retry(
+        total=getattr(settings, "BUNNY_MAX_RETRIES", 3),
+        backoff_factor=getattr(settings, "BUNNY_RETRY_BACKOFF", 0.3),
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD", "DELETE"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=getattr(settings, "BUNNY_POOL_MAXSIZE", 10),
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """``requests.Session`` compartida por proceso (se recrea tras un fork)."""
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+    return _session
+
+
+class _UploadStream:
+    """
+    Cuerpo de un PUT leído del ``File`` de Django por bloques.
+
+    ``requests`` usa ``__len__`` para el ``Content-Length`` y llama a
+    ``read`` por bloques mientras envía, así nunca se carga el archivo
+    completo en memoria.
+    """
+
+    def __init__(self, content, size, chunk_size=CHUNK_SIZE):
+        self.content = content
+        self.size = size
+        self.chunk_size = chunk_size
+
+    def __len__(self):
+        return self.size
+
+    def read(self, n=-1):
+        if n is None or n < 0 or n > self.chunk_size:
+            n = self.chunk_size
+        return self.content.read(n)
+
+
+def _sha256_hex(content, chunk_size=CHUNK_SIZE):
+    """SHA-256 del archivo leído por bloques (deja el puntero al inicio)."""
+    digest = hashlib.sha256()
+    content.seek(0)
+    for chunk in iter(lambda: content.read(chunk_size), b""):
+        digest.update(chunk)
+    content.seek(0)
+    return digest.hexdigest().upper()
+
+
+def _spooled_file(response, name):
+    """
+    Copia el cuerpo de ``response`` a un ``SpooledTemporaryFile`` y lo devuelve
+    como ``File``: en memoria hasta ``SPOOL_MAX_MEMORY`` bytes y en disco
+    después, así se puede hacer ``seek`` (p. ej. ``get_image_dimensions``).
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    try:
+        with response:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                spool.write(chunk)
+    except requests.exceptions.RequestException as e:
+        spool.close()
+        raise IOError(f"Error descargando de Bunny.net: {e}")
+    file = File(spool, name)
+    file.size = spool.tell()
+    spool.seek(0)
+    return file
+
+
+class _DiskCache:
+    """
+    Caché de lectura en disco para ``_open``, acotada a ``max_bytes``.
+
+    Cada objeto se guarda como ``<sha256(name)>.bin`` más un ``.json`` con
+    nombre, ETag y tamaño. Un archivo cuyo tamaño no coincide se descarta.
+    El desalojo es LRU usando el ``mtime``, que se actualiza en cada lectura.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, name):
+        base = self.directory / hashlib.sha256(name.encode("utf-8")).hexdigest()
+        return base.with_suffix(".bin"), base.with_suffix(".json")
+
+    def get(self, name):
+        """``(ruta, metadatos)`` de la copia local válida, o ``(None, None)``."""
+        data, meta = self._paths(name)
+        try:
+            info = json.loads(meta.read_text())
+            stat = data.stat()
+        except (OSError, ValueError):
+            return None, None
+        if stat.st_size != info.get("size"):
+            self.evict(name)
+            return None, None
+        with suppress(OSError):
+            os.utime(data)
+        return data, info
+
+    def put(self, name, response):
+        """Copia el cuerpo de ``response`` por bloques y devuelve la ruta local."""
+        data, meta = self._paths(name)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    out.write(chunk)
+                    size += len(chunk)
+            os.replace(tmp, data)
+        except BaseException:
+            with suppress(OSError):
+                os.unlink(tmp)
+            raise
+        meta.write_text(json.dumps({
+            "name": name,
+            "etag": response.headers.get("ETag", ""),
+            "size": size,
+        }))
+        self._trim()
+        return data
+
+    def evict(self, name):
+        for path in self._paths(name):
+            with suppress(OSError):
+                path.unlink()
+
+    def _trim(self):
+        entries, total = [], 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".bin"):
+                with suppress(OSError):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, Path(entry.path), stat.st_size))
+                    total += stat.st_size
+        for _, path, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for stale in (path, path.with_suffix(".json")):
+                with suppress(OSError):
+                    stale.unlink()
+            total -= size
+
 
 @deconstructible
 class BunnyStorage(Storage):
@@ -37,6 +232,32 @@ class BunnyStorage(Storage):
             )
         else:
             self.storage_url = f"https://storage.bunnycdn.com/{self.storage_zone}/"
+        self.connect_timeout = getattr(settings, "BUNNY_CONNECT_TIMEOUT", 5)
+        self.timeouts = {**DEFAULT_TIMEOUTS, **getattr(settings, "BUNNY_TIMEOUTS", {})}
+        self.upload_checksum = getattr(settings, "BUNNY_UPLOAD_CHECKSUM", False)
+        # Caché de lectura en disco (opcional) para _open
+        cache_dir = getattr(settings, "BUNNY_CACHE_DIR", "")
+        self.cache = (
+            _DiskCache(cache_dir, getattr(settings, "BUNNY_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+            if cache_dir
+            else None
+        )
+        self.cache_revalidate = getattr(settings, "BUNNY_CACHE_REVALIDATE", False)
+        # name -> {"exists": bool, "size": int | None} de subidas y HEADs
+        self.metadata_cache = LRUCache(
+            maxsize=getattr(settings, "BUNNY_METADATA_CACHE_SIZE", 4096),
+            ttl=getattr(settings, "BUNNY_METADATA_CACHE_TTL", 300),
+        )
+
+    def _timeout(self, operation):
+        """``(connect, read)`` para ``requests`` según la operación."""
+        return (self.connect_timeout, self.timeouts[operation])
+
+    def _request(self, method, name, operation, **kwargs):
+        url = f"{self.storage_url}{name}"
+        return get_session().request(
+            method, url, timeout=self._timeout(operation), **kwargs
+        )
 
     def _headers(self, content_type="application/octet-stream"):
         h = {
@@ -63,18 +284,27 @@ class BunnyStorage(Storage):
         if hasattr(content, "seek"):
             content.seek(0)
 
-        data = content.read()
-        if not data:
+        size = content.size
+        if not size:
             raise IOError("El contenido del archivo está vacío.")
 
-        logger.debug("Tamaño del archivo: %d bytes", len(data))
+        logger.debug("Tamaño del archivo: %d bytes", size)
+
+        headers = self._headers()
+        if self.upload_checksum:
+            # Bunny valida el SHA-256 (hex en mayúsculas) del cuerpo recibido;
+            # va en un header, así que se calcula en una pasada previa
+            headers["Checksum"] = _sha256_hex(content)
 
         try:
-            response = requests.put(
-                url, headers=self._headers(), data=data, timeout=30
+            response = self._request(
+                "PUT", name, "upload", headers=headers,
+                data=_UploadStream(content, size),
             )
         except requests.exceptions.Timeout:
-            raise IOError("Timeout al subir archivo a Bunny.net (30s)")
+            raise IOError(
+                f"Timeout al subir archivo a Bunny.net ({self.timeouts['upload']}s)"
+            )
         except requests.exceptions.ConnectionError as e:
             raise IOError(f"Error de conexión con Bunny.net: {e}")
 
@@ -87,70 +317,134 @@ class BunnyStorage(Storage):
                 f"{response.status_code} - {response.text}"
             )
 
-        logger.info("Subida exitosa: %s (%d bytes)", name, len(data))
+        logger.info("Subida exitosa: %s (%d bytes)", name, size)
+        self.metadata_cache.set(name, {"exists": True, "size": size})
         return name
 
-    def _open(self, name, mode="rb"):
-        url = f"{self.storage_url}{name}"
+    def _download(self, name, headers=None):
+        """GET en streaming; el cuerpo se lee después, bajo demanda."""
         try:
-            response = requests.get(url, headers=self._headers(None), timeout=30)
+            return self._request(
+                "GET", name, "download",
+                headers={**self._headers(None), **(headers or {})},
+                stream=True,
+            )
         except requests.exceptions.RequestException as e:
             raise FileNotFoundError(f"Error descargando de Bunny.net: {e}")
+
+    def _open_local(self, path, name):
+        try:
+            return File(open(path, "rb"), name)
+        except FileNotFoundError:  # desalojado por otro proceso
+            return None
+
+    def _open(self, name, mode="rb"):
+        response = None
+        if self.cache is not None:
+            path, info = self.cache.get(name)
+            if path is not None:
+                if self.cache_revalidate and info.get("etag"):
+                    # Revalidar: 304 = la copia local sigue vigente
+                    response = self._download(name, {"If-None-Match": info["etag"]})
+                    if response.status_code == 304:
+                        response.close()
+                        response = None
+                    else:
+                        path = None
+                if path is not None:
+                    local = self._open_local(path, name)
+                    if local is not None:
+                        return local
+
+        if response is None:
+            response = self._download(name)
         if response.status_code != 200:
+            response.close()
             raise FileNotFoundError(f"Archivo no encontrado en Bunny.net: {name}")
-        return ContentFile(response.content)
 
-    def exists(self, name):
-        url = f"{self.storage_url}{name}"
+        if self.cache is not None:
+            with response:
+                path = self.cache.put(name, response)
+            local = self._open_local(path, name)
+            if local is not None:
+                return local
+            response = self._download(name)
+            if response.status_code != 200:
+                response.close()
+                raise FileNotFoundError(f"Archivo no encontrado en Bunny.net: {name}")
+        return _spooled_file(response, name)
+
+    def _metadata(self, name):
+        """
+        ``{"exists", "size"}`` de ``name``, desde caché o con un HEAD.
+
+        Devuelve ``None`` si el HEAD falla (no se cachea).
+        """
+        meta = self.metadata_cache.get(name)
+        if meta is not None:
+            metrics.incr("bunny_metadata.hit")
+            return meta
+        metrics.incr("bunny_metadata.miss")
+
+        start = time.perf_counter()
         try:
-            response = requests.head(url, headers=self._headers(None), timeout=5)
-            return response.status_code == 200
-        except requests.exceptions.RequestException:
-            return False
+            response = self._request(
+                "HEAD", name, "metadata", headers=self._headers(None)
+            )
+        except requests.exceptions.RequestException as e:
+            logger.warning("Error consultando metadatos en Bunny (%s): %s", name, e)
+            return None
+        finally:
+            metrics.incr("bunny_head.count")
+            metrics.incr("bunny_head.seconds", time.perf_counter() - start)
+
+        if response.status_code == 200:
+            meta = {
+                "exists": True,
+                "size": int(response.headers.get("Content-Length", 0)),
+            }
+        elif response.status_code == 404:
+            meta = {"exists": False, "size": None}
+        else:
+            logger.warning("Bunny HEAD %s -> %s", name, response.status_code)
+            return None
+        self.metadata_cache.set(name, meta)
+        return meta
+
+    def exists(self, name):
+        meta = self._metadata(name)
+        return bool(meta and meta["exists"])
 
     def delete(self, name):
-        url = f"{self.storage_url}{name}"
+        self.metadata_cache.pop(name)
         try:
-            response = requests.delete(url, headers=self._headers(None), timeout=15)
-            if response.status_code not in (200, 404):
+            response = self._request(
+                "DELETE", name, "delete", headers=self._headers(None)
+            )
+            if response.status_code in (200, 404):
+                self.metadata_cache.set(name, {"exists": False, "size": None})
+            else:
                 logger.warning(
-                    "Bunny DELETE %s -> %s", url, response.status_code
+                    "Bunny DELETE %s -> %s", name, response.status_code
                 )
         except requests.exceptions.RequestException as e:
             logger.warning("Error eliminando de Bunny: %s", e)
+        if self.cache is not None:
+            self.cache.evict(name)
 
     def _sign_url(self, url, expiration_seconds=None):
         """
         Genera una URL firmada con Token Authentication de Bunny.net.
-        Ref: https://docs.bunny.net/docs/cdn-token-authentication
-        """
-        if not self.token_key:
-            return url
 
+        La expiración se alinea a bloques (ver ``apps.common.bunny``), así la
+        misma foto conserva su URL durante el bloque y la firma se memoiza.
+        """
         if expiration_seconds is None:
             expiration_seconds = self.token_expiration
-
-        expires = int(time.time()) + expiration_seconds
-
-        # Extraer el path de la URL
-        parsed = urlparse(url)
-        path = parsed.path
-
-        # Hash: SHA256(token_key + path + expires)
-        hashable = f"{self.token_key}{path}{expires}"
-        token_hash = hashlib.sha256(hashable.encode("utf-8")).digest()
-        token = b64encode(token_hash).decode("utf-8")
-
-        # Limpiar caracteres no válidos para URL
-        token = (
-            token.replace("\n", "")
-            .replace("+", "-")
-            .replace("/", "_")
-            .replace("=", "")
+        return sign_url(
+            url, token_key=self.token_key, expiration_seconds=expiration_seconds
         )
 
-        return f"{url}?token={token}&expires={expires}"
-
     def url(self, name):
         """
         Retorna la URL pública del archivo.
@@ -168,19 +462,16 @@ class BunnyStorage(Storage):
         return raw_url
 
     def size(self, name):
-        url = f"{self.storage_url}{name}"
-        try:
-            response = requests.head(url, headers=self._headers(None), timeout=5)
-            if response.status_code == 200:
-                return int(response.headers.get("Content-Length", 0))
-        except requests.exceptions.RequestException:
-            pass
-        return 0
+        meta = self._metadata(name)
+        if meta is None:
+            raise IOError(f"No se pudo obtener el tamaño de {name} en Bunny.net")
+        if not meta["exists"]:
+            raise FileNotFoundError(f"Archivo no encontrado en Bunny.net: {name}")
+        return meta["size"]
 
     def listdir(self, path=""):
-        url = f"{self.storage_url}{path}"
         try:
-            response = requests.get(url, headers=self._headers(None), timeout=15)
+            response = self._request("GET", path, "list", headers=self._headers(None))
         except requests.exceptions.RequestException:
             return [], []
         if response.status_code != 200:
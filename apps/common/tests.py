@@ -1,3 +1,137 @@
-from django.test import TestCase
+import threading
+from datetime import timedelta
+from http.server import ThreadingHTTPServer
+from io import BytesIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.images import get_image_dimensions
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+
+from apps.inventory.models import Category, InventoryItem, InventoryTxn
+
+from .cache import bump_version, get_or_compute
+from .management.commands.bench_bunny_storage import FakeBunnyHandler
+from .pagination import KeysetPaginator
+from .storage import SPOOL_MAX_MEMORY, BunnyStorage
+
+
+class KeysetPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name="General")
+        item = InventoryItem.objects.create(
+            sku="A", slug="a", category=category, description="A",
+            stock=0, min_stock=0, max_stock=10,
+        )
+        start = timezone.now()
+        # Pares con el mismo happened_at: el id desempata
+        InventoryTxn.objects.bulk_create([
+            InventoryTxn(
+                item=item, txn_type=InventoryTxn.TXN_ADJUST, qty=1,
+                happened_at=start - timedelta(minutes=i // 2),
+            )
+            for i in range(11)
+        ])
+        cls.expected = list(
+            InventoryTxn.objects.order_by("-happened_at", "-id").values_list("pk", flat=True)
+        )
+
+    def paginator(self):
+        return KeysetPaginator(InventoryTxn.objects.all(), 3)
+
+    def test_walks_forward_and_back_over_ties(self):
+        paginator = self.paginator()
+        pages = [paginator.get_page()]
+        while pages[-1].has_next:
+            pages.append(paginator.get_page(pages[-1].next_cursor))
+        self.assertEqual([t.pk for page in pages for t in page], self.expected)
+        self.assertFalse(pages[0].has_previous)
+
+        back = paginator.get_page(pages[-1].previous_cursor, "prev")
+        self.assertEqual([t.pk for t in back], [t.pk for t in pages[-2]])
+
+    def test_invalid_cursor_is_first_page(self):
+        page = self.paginator().get_page("no-es-un-cursor")
+        self.assertEqual([t.pk for t in page], self.expected[:3])
+
+    def test_bounds_leading_column_for_index_seek(self):
+        paginator = self.paginator()
+        cursor = paginator.get_page().next_cursor
+        with CaptureQueriesContext(connection) as ctx:
+            paginator.get_page(cursor)
+            paginator.get_page(cursor, "prev")
+        column = '"inventory_inventorytxn"."happened_at"'
+        self.assertIn(f"{column} <= ", ctx.captured_queries[0]["sql"])
+        self.assertIn(f"{column} >= ", ctx.captured_queries[1]["sql"])
+
+
+@override_settings(VERSIONED_CACHE=True)
+class GetOrComputeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return self.calls
+
+    def get(self):
+        return get_or_compute("stats", self.compute, versions=("a", "b", "c", "d"))
+
+    def test_reads_all_versions_at_once(self):
+        with mock.patch.object(cache, "get_many", wraps=cache.get_many) as get_many:
+            self.assertEqual(self.get(), 1)
+            self.assertEqual(self.get(), 1)
+        self.assertEqual(get_many.call_count, 2)  # una lectura de versiones por llamada
+
+        bump_version("c")
+        self.assertEqual(self.get(), 2)
+
+    @override_settings(VERSIONED_CACHE=False)
+    def test_disabled_always_computes(self):
+        self.assertEqual([self.get(), self.get()], [1, 2])
+
+
+class BunnyStorageOpenTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBunnyHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.addClassCleanup(cls.server.server_close)
+        cls.addClassCleanup(cls.server.shutdown)
+
+    def setUp(self):
+        FakeBunnyHandler.objects = {}
+        self.storage = BunnyStorage()
+        self.storage.storage_url = f"http://127.0.0.1:{self.server.server_address[1]}/b/"
+        self.storage.cache = None
+
+    def put(self, name, data):
+        FakeBunnyHandler.objects[f"/b/{name}"] = data
+
+    def test_open_without_disk_cache_is_seekable(self):
+        png = BytesIO()
+        Image.new("RGB", (7, 3), "red").save(png, "PNG")
+        self.put("a.png", png.getvalue())
+
+        with self.storage.open("a.png") as f:
+            self.assertEqual(f.read(), png.getvalue())
+            f.seek(0)
+            self.assertEqual(f.read(8), b"\x89PNG\r\n\x1a\n")
+            self.assertEqual(f.size, len(png.getvalue()))
+        self.assertEqual(get_image_dimensions(self.storage.open("a.png")), (7, 3))
+
+    def test_large_body_spills_to_disk(self):
+        data = bytes(range(256)) * (SPOOL_MAX_MEMORY // 256 + 1)
+        self.put("big.bin", data)
+        with self.storage.open("big.bin") as f:
+            f.seek(len(data) - 256)
+            self.assertEqual(f.read(), bytes(range(256)))
+            f.seek(0)
+            self.assertEqual(f.read(), data)
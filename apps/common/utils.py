@@ -47,6 +47,30 @@ def normalize_name(value: str) -> str:
     return cleaned
 
 
+def chunked(iterable, size: int):
+    """
+    Agrupa ``iterable`` en listas de hasta ``size`` elementos.
+
+    Consume el iterable de forma perezosa, así que sirve con
+    ``QuerySet.iterator()`` sin cargar todo en memoria.
+
+    Args:
+        iterable: Cualquier iterable.
+        size: Tamaño máximo de cada lote.
+
+    Yields:
+        Listas con los elementos de cada lote.
+    """
+    chunk = []
+    for value in iterable:
+        chunk.append(value)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
 def slugify_filename(filename: str) -> str:
     """
     Convierte un nombre de archivo a un formato SEO-friendly (slug).
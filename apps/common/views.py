@@ -1,3 +1,15 @@
-from django.shortcuts import render
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
 
-# Create your views here.
+from . import metrics as metrics_registry
+
+
+@login_required
+@never_cache
+def metrics(request):
+    """Contadores de métricas del proceso actual (solo staff)."""
+    if not request.user.is_staff:
+        raise PermissionDenied
+    return JsonResponse(metrics_registry.snapshot())
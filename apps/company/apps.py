@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class CompanyConfig(AppConfig):
     name = "apps.company"
+
+    def ready(self):
+        from . import signals  # noqa: F401
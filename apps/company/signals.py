@@ -0,0 +1,17 @@
+"""
+Signal handlers for the company app (connected in ``CompanyConfig.ready``).
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.inventory.context_processors import invalidate_logo_cache
+
+from .models.company import Company
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def invalidate_company_cache(sender, using, **kwargs):
+    transaction.on_commit(invalidate_logo_cache, using=using)
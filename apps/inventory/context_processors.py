@@ -1,17 +1,35 @@
-import os
 from django.conf import settings
+
+from apps.common.cache import signed_url_bucket
+from apps.common.lru import LRUCache
 from apps.company.models.company import Company
 
+# bloque de firma -> logo_url, por proceso; el TTL acota cuánto ven los
+# demás workers un logo viejo (el que guarda la empresa invalida el suyo)
+_logo_cache = LRUCache(maxsize=1, ttl=getattr(settings, "LOGO_CACHE_TTL", 60))
+_MISSING = object()
 
-def logo_context(request):
-    """Agrega la URL del logo de la empresa al contexto de todos los templates"""
+
+def _resolve_logo_url():
     try:
         company = Company.objects.first()
         if company and company.logo:
-            logo_url = company.logo.url
-        else:
-            logo_url = None
+            return company.logo.url
     except Exception:
-        logo_url = None
+        pass
+    return None
+
 
+def invalidate_logo_cache():
+    """Descarta la URL del logo cacheada en este proceso."""
+    _logo_cache.clear()
+
+
+def logo_context(request):
+    """Agrega la URL del logo de la empresa al contexto de todos los templates"""
+    key = signed_url_bucket()
+    logo_url = _logo_cache.get(key, _MISSING)
+    if logo_url is _MISSING:
+        logo_url = _resolve_logo_url()
+        _logo_cache.set(key, logo_url)
     return {"logo_url": logo_url}
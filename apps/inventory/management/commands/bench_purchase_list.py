@@ -0,0 +1,114 @@
+import time
+import tracemalloc
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.db import connection, transaction
+
+from apps.inventory.models.inventory import Category, InventoryItem
+from apps.inventory.models.purchases import Supplier, Purchase, PurchaseLine
+
+
+def _legacy_page(per_page):
+    """Listado previo: suma en Python las líneas de TODAS las compras filtradas."""
+    purchases = (
+        Purchase.objects.select_related("supplier")
+        .prefetch_related("lines")
+        .order_by("-purchased_at")
+    )
+    for p in purchases:
+        p.total = sum(line.qty * line.unit_price for line in p.lines.all())
+    page = Paginator(purchases, per_page).get_page(1)
+    return [(p.pk, p.supplier.name, p.total) for p in page]
+
+
+def _stored_total_page(per_page):
+    """Listado actual: ``Purchase.total`` almacenado, solo la página visible."""
+    purchases = Purchase.objects.select_related("supplier").order_by("-purchased_at", "-pk")
+    page = Paginator(purchases, per_page).get_page(1)
+    return [(p.pk, p.supplier.name, p.total) for p in page]
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide memoria pico y latencia de la primera página de purchase_list al crecer "
+        "el historial de compras. Todo se ejecuta en una transacción que se revierte."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=str,
+            default="1000,10000,50000",
+            help="Tamaños de historial separados por coma (default: 1000,10000,50000).",
+        )
+        parser.add_argument(
+            "--lines", type=int, default=3,
+            help="Líneas por compra (default: 3).",
+        )
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(s) for s in options["sizes"].split(",") if s.strip())
+        n_lines = options["lines"]
+
+        self.stdout.write(f"purchase_list, primera página de 10 ({connection.vendor}):")
+        self.stdout.write(f"  {'compras':>8}  {'antes ms':>9} {'antes KiB':>10}  {'ahora ms':>9} {'ahora KiB':>10}")
+
+        with transaction.atomic():
+            tag = uuid.uuid4().hex[:8]
+            supplier = Supplier.objects.create(name=f"Proveedor bench {tag}")
+            category = Category.objects.create(name=f"Bench {tag}")
+            items = InventoryItem.objects.bulk_create([
+                InventoryItem(
+                    sku=f"BENCH-{tag}-{i}", slug=f"bench-{tag}-{i}", category=category,
+                    description=f"Producto bench {tag} {i}", stock=0, min_stock=0, max_stock=0,
+                )
+                for i in range(n_lines)
+            ])
+
+            created = Purchase.objects.count()
+            for size in sizes:
+                self._grow(supplier, items, size - created)
+                created = max(created, size)
+
+                legacy_ms, legacy_kib = self._measure(_legacy_page)
+                stored_ms, stored_kib = self._measure(_stored_total_page)
+                self.stdout.write(
+                    f"  {created:>8}  {legacy_ms:>9.1f} {legacy_kib:>10.0f}  "
+                    f"{stored_ms:>9.1f} {stored_kib:>10.0f}"
+                )
+
+            transaction.set_rollback(True)
+
+    def _grow(self, supplier, items, count, batch=5000):
+        unit_price = Decimal("10.5000")
+        today = date.today()
+        while count > 0:
+            size = min(batch, count)
+            purchases = Purchase.objects.bulk_create([
+                Purchase(
+                    supplier=supplier,
+                    purchased_at=today - timedelta(days=i % 3650),
+                    ref=f"BENCH-{i}",
+                    total=unit_price * len(items),
+                )
+                for i in range(size)
+            ])
+            PurchaseLine.objects.bulk_create([
+                PurchaseLine(purchase=p, item=item, qty=1, unit_price=unit_price)
+                for p in purchases
+                for item in items
+            ])
+            count -= size
+
+    def _measure(self, fn):
+        tracemalloc.start()
+        start = time.perf_counter()
+        fn(10)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return elapsed * 1000, peak / 1024
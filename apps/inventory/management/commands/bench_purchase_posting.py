@@ -0,0 +1,138 @@
+import time
+import uuid
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.inventory.models.inventory import Category, InventoryItem
+from apps.inventory.models.purchases import Supplier, Purchase, PurchaseLine
+from apps.inventory.models.transactions import InventoryTxn
+from apps.inventory.services import purchases as purchase_svc
+
+
+def _legacy_create_purchase(*, supplier_id, purchased_at, ref="", lines_data):
+    """Bucle por línea previo al motor de posteo (referencia para comparar)."""
+    valid_lines = purchase_svc._validate_lines(lines_data)
+
+    with transaction.atomic():
+        purchase = Purchase.objects.create(
+            supplier_id=supplier_id, purchased_at=purchased_at, ref=ref,
+        )
+        for ld in valid_lines:
+            item = InventoryItem.objects.select_for_update().get(pk=ld["item"])
+            qty = int(ld["qty"])
+            unit_price = float(ld["unit_price"])
+
+            PurchaseLine.objects.create(
+                purchase=purchase, item=item, qty=qty, unit_price=unit_price,
+            )
+            item.stock += qty
+            item.save()
+
+            InventoryTxn.objects.create(
+                item=item,
+                txn_type=InventoryTxn.TXN_PURCHASE,
+                qty=qty,
+                unit_price=unit_price,
+                supplier=purchase.supplier,
+                purchase=purchase,
+                happened_at=timezone.now(),
+                note=f"Compra #{purchase.id}",
+            )
+    return purchase
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara consultas y tiempo de create_purchase contra el bucle por línea. "
+        "Todo se ejecuta en una transacción que se revierte al final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lines", type=int, default=200,
+            help="Número de líneas por compra (default: 200).",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=3,
+            help="Repeticiones por implementación; se reporta la mejor (default: 3).",
+        )
+
+    def handle(self, *args, **options):
+        n_lines = options["lines"]
+        repeat = options["repeat"]
+
+        with transaction.atomic():
+            items = self._fixtures(n_lines)
+            supplier = self._supplier
+            lines_data = {
+                str(i): {"item": str(item.pk), "qty": "3", "unit_price": "12.50"}
+                for i, item in enumerate(items)
+            }
+
+            results = {}
+            for label, fn in (
+                ("por línea", _legacy_create_purchase),
+                ("set-based", purchase_svc.create_purchase),
+            ):
+                results[label] = self._measure(
+                    fn, repeat,
+                    supplier_id=supplier.pk,
+                    purchased_at=date.today(),
+                    ref="BENCH",
+                    lines_data=lines_data,
+                )
+
+            expected = 3 * 2 * repeat
+            stocks = set(
+                InventoryItem.objects.filter(pk__in=[i.pk for i in items])
+                .values_list("stock", flat=True)
+            )
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"Compra de {n_lines} líneas ({connection.vendor}):")
+        for label, (queries, elapsed) in results.items():
+            self.stdout.write(f"  {label:<10} {queries:>6} consultas  {elapsed * 1000:>9.1f} ms")
+
+        legacy_q, legacy_t = results["por línea"]
+        new_q, new_t = results["set-based"]
+        self.stdout.write(
+            f"  Reducción: {legacy_q / max(new_q, 1):.1f}x consultas, "
+            f"{legacy_t / max(new_t, 1e-9):.1f}x tiempo"
+        )
+        if stocks == {expected}:
+            self.stdout.write(self.style.SUCCESS("✔ Ambas implementaciones dejan el mismo stock"))
+        else:
+            self.stderr.write(self.style.ERROR(f"Stock inconsistente: {sorted(stocks)}"))
+
+    def _fixtures(self, n_lines):
+        tag = uuid.uuid4().hex[:8]
+        category = Category.objects.create(name=f"Bench {tag}")
+        self._supplier = Supplier.objects.create(name=f"Proveedor bench {tag}")
+        return InventoryItem.objects.bulk_create([
+            InventoryItem(
+                sku=f"BENCH-{tag}-{i}",
+                slug=f"bench-{tag}-{i}",
+                category=category,
+                description=f"Producto bench {tag} {i}",
+                stock=0,
+                min_stock=0,
+                max_stock=1000,
+            )
+            for i in range(n_lines)
+        ])
+
+    def _measure(self, fn, repeat, **kwargs):
+        best = None
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                fn(**kwargs)
+                elapsed = time.perf_counter() - start
+            sample = (len(ctx.captured_queries), elapsed)
+            if best is None or sample[1] < best[1]:
+                best = sample
+        return best
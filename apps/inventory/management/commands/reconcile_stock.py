@@ -0,0 +1,73 @@
+import csv
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from apps.inventory.services import reconciliation as reconciliation_svc
+
+
+DEFAULT_OUTPUT = Path("reconcile_stock.csv")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el stock de cada producto contra la suma de su ledger (InventoryTxn), "
+        "genera un reporte CSV de diferencias y opcionalmente registra ajustes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-o", "--output",
+            type=str,
+            default=None,
+            help="Archivo CSV del reporte. Por defecto: reconcile_stock.csv",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Productos por lote (default: 5000).",
+        )
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Registrar transacciones ADJUST para que el ledger cuadre con el stock.",
+        )
+
+    def handle(self, *args, **options):
+        output = Path(options["output"]) if options["output"] else DEFAULT_OUTPUT
+        self.stdout.write(f"Conciliando stock contra ledger → {output} …")
+
+        drifted = []
+        count = 0
+        fixed = 0
+        with output.open("w", newline="", encoding="utf-8") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(["item_id", "sku", "stock", "ledger", "diferencia"])
+            for pk, sku, stock, ledger in reconciliation_svc.iter_drift(
+                chunk_size=options["chunk_size"]
+            ):
+                writer.writerow([pk, sku, stock, ledger, stock - ledger])
+                count += 1
+                if options["fix"]:
+                    drifted.append((pk, sku, stock, ledger))
+                    if len(drifted) >= options["chunk_size"]:
+                        fixed += reconciliation_svc.post_corrections(drifted)
+                        drifted = []
+
+        if options["fix"] and drifted:
+            fixed += reconciliation_svc.post_corrections(drifted)
+
+        if not count:
+            self.stdout.write(self.style.SUCCESS("✔ Stock y ledger coinciden"))
+        elif options["fix"]:
+            self.stdout.write(self.style.SUCCESS(
+                f"✔ {fixed} de {count} productos corregidos con ajustes "
+                "(el resto cuadró al volver a verificar)"
+                if fixed != count
+                else f"✔ {count} productos corregidos con ajustes"
+            ))
+        else:
+            self.stdout.write(self.style.WARNING(
+                f"⚠ {count} productos con diferencias (use --fix para registrar ajustes)"
+            ))
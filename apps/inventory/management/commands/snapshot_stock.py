@@ -0,0 +1,40 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.inventory.services import snapshots as snapshot_svc
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera los cortes diarios de stock (StockSnapshot) de forma incremental. "
+        "Pensado para ejecutarse una vez al día (cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--until",
+            type=str,
+            default=None,
+            help="Último día a cortar (YYYY-MM-DD). Por defecto: ayer.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Productos por lote (default: 2000).",
+        )
+
+    def handle(self, *args, **options):
+        if options["until"]:
+            try:
+                until = date.fromisoformat(options["until"])
+            except ValueError:
+                raise CommandError(f"Fecha inválida: {options['until']}")
+        else:
+            until = timezone.localdate() - timedelta(days=1)
+
+        self.stdout.write(f"Generando cortes de stock hasta {until} …")
+        written = snapshot_svc.take_snapshots(until=until, chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"✔ {written} cortes escritos"))
@@ -0,0 +1,131 @@
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, connections, OperationalError
+from django.db.models import Sum
+
+from apps.inventory.models.inventory import Category, InventoryItem
+from apps.inventory.models.transactions import Requisition, InventoryTxn
+from apps.inventory.services import requisitions as requisition_svc
+from apps.inventory.services.stock import InsufficientStockError
+
+
+class Command(BaseCommand):
+    help = (
+        "Prueba de estrés: varios hilos crean requisiciones concurrentes sobre los "
+        "mismos productos en orden aleatorio y se reportan throughput y deadlocks. "
+        "Pensado para PostgreSQL; en SQLite las escrituras se serializan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8, help="Hilos concurrentes (default: 8).")
+        parser.add_argument("--requests", type=int, default=50, help="Requisiciones por hilo (default: 50).")
+        parser.add_argument("--items", type=int, default=20, help="Productos compartidos (default: 20).")
+        parser.add_argument("--lines", type=int, default=5, help="Líneas por requisición (default: 5).")
+        parser.add_argument(
+            "--initial-stock", type=int, default=100_000,
+            help="Stock inicial de cada producto (default: 100000).",
+        )
+        parser.add_argument("--keep", action="store_true", help="No borrar los datos generados.")
+
+    def handle(self, *args, **options):
+        n_threads = options["threads"]
+        per_thread = options["requests"]
+        n_lines = min(options["lines"], options["items"])
+        initial = options["initial_stock"]
+
+        tag = uuid.uuid4().hex[:8]
+        category = Category.objects.create(name=f"Stress {tag}")
+        user = get_user_model().objects.create_user(username=f"stress-{tag}")
+        items = InventoryItem.objects.bulk_create([
+            InventoryItem(
+                sku=f"STRESS-{tag}-{i}",
+                slug=f"stress-{tag}-{i}",
+                category=category,
+                description=f"Producto stress {tag} {i}",
+                stock=initial,
+                min_stock=0,
+                max_stock=initial,
+            )
+            for i in range(options["items"])
+        ])
+        item_ids = [item.pk for item in items]
+        outcomes = Counter()
+        lock = threading.Lock()
+
+        def worker(seed):
+            rng = random.Random(seed)
+            try:
+                for _ in range(per_thread):
+                    # Orden aleatorio: el servicio debe bloquear por pk igualmente
+                    chosen = rng.sample(item_ids, n_lines)
+                    lines_data = {
+                        str(i): {"item": str(pk), "qty": str(rng.randint(1, 3))}
+                        for i, pk in enumerate(chosen)
+                    }
+                    try:
+                        requisition_svc.create_requisition(
+                            user=user, requested_at=date.today(), lines_data=lines_data,
+                        )
+                        result = "ok"
+                    except InsufficientStockError:
+                        result = "shortage"
+                    except OperationalError as exc:
+                        result = "deadlock" if "deadlock" in str(exc).lower() else "db_error"
+                    with lock:
+                        outcomes[result] += 1
+            finally:
+                connections.close_all()
+
+        self.stdout.write(
+            f"{n_threads} hilos × {per_thread} requisiciones × {n_lines} líneas "
+            f"sobre {len(item_ids)} productos ({connection.vendor}) …"
+        )
+        if connection.vendor == "sqlite":
+            self.stdout.write(self.style.WARNING(
+                "⚠ SQLite bloquea la base completa: espere errores 'database is locked'."
+            ))
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(n_threads)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+
+        issued = (
+            InventoryTxn.objects.filter(item_id__in=item_ids)
+            .aggregate(total=Sum("qty"))["total"] or 0
+        )
+        remaining = (
+            InventoryItem.objects.filter(pk__in=item_ids)
+            .aggregate(total=Sum("stock"))["total"] or 0
+        )
+        consistent = remaining == initial * len(item_ids) + issued
+
+        total = sum(outcomes.values())
+        self.stdout.write(f"  Tiempo:        {elapsed:.2f} s")
+        self.stdout.write(f"  Throughput:    {outcomes['ok'] / elapsed:.1f} requisiciones/s")
+        self.stdout.write(f"  Exitosas:      {outcomes['ok']}/{total}")
+        self.stdout.write(f"  Sin stock:     {outcomes['shortage']}")
+        self.stdout.write(f"  Deadlocks:     {outcomes['deadlock']}")
+        self.stdout.write(f"  Otros errores: {outcomes['db_error']}")
+
+        if not options["keep"]:
+            Requisition.objects.filter(requested_by=user).delete()
+            InventoryItem.objects.filter(pk__in=item_ids).delete()
+            category.delete()
+            user.delete()
+
+        if outcomes["deadlock"] or not consistent:
+            self.stderr.write(self.style.ERROR(
+                f"✘ deadlocks={outcomes['deadlock']} stock_consistente={consistent}"
+            ))
+            raise SystemExit(1)
+        self.stdout.write(self.style.SUCCESS("✔ Sin deadlocks y stock consistente con el ledger"))
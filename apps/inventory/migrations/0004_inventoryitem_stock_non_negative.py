@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-17 04:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0003_alter_supplier_options_supplier_active_and_more'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='inventoryitem',
+            constraint=models.CheckConstraint(condition=models.Q(('stock__gte', 0)), name='inventoryitem_stock_non_negative'),
+        ),
+    ]
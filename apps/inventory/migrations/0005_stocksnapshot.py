@@ -0,0 +1,29 @@
+# Generated by Django 6.0.1 on 2026-10-17 04:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0004_inventoryitem_stock_non_negative'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('stock', models.IntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='inventory.inventoryitem')),
+            ],
+            options={
+                'verbose_name': 'Corte de stock',
+                'verbose_name_plural': 'Cortes de stock',
+                'constraints': [models.UniqueConstraint(fields=('item', 'date'), name='stocksnapshot_item_date_uniq')],
+            },
+        ),
+    ]
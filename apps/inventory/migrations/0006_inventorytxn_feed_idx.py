@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-17 04:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0005_stocksnapshot'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inventorytxn',
+            index=models.Index(fields=['happened_at', 'id'], name='inventorytxn_feed_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 6.0.1 on 2026-10-17 04:15
+
+from django.db import migrations, models
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_totals(apps, schema_editor):
+    Purchase = apps.get_model("inventory", "Purchase")
+    PurchaseLine = apps.get_model("inventory", "PurchaseLine")
+    amount = DecimalField(max_digits=18, decimal_places=4)
+    line_totals = (
+        PurchaseLine.objects.filter(purchase=OuterRef("pk"))
+        .values("purchase")
+        .annotate(total=Sum(F("qty") * F("unit_price"), output_field=amount))
+        .values("total")
+    )
+    Purchase.objects.update(total=Coalesce(Subquery(line_totals, output_field=amount), 0, output_field=amount))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0006_inventorytxn_feed_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='purchase',
+            name='total',
+            field=models.DecimalField(decimal_places=4, default=0, max_digits=18),
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='purchase',
+            index=models.Index(fields=['purchased_at', 'id'], name='purchase_list_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+import sqlite3
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS inventoryitem_sku_trgm "
+            "ON inventory_inventoryitem USING gin ((UPPER(sku::text)) gin_trgm_ops)"
+        )
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS inventoryitem_description_trgm "
+            "ON inventory_inventoryitem USING gin ((UPPER(description::text)) gin_trgm_ops)"
+        )
+    elif vendor == "sqlite" and sqlite3.sqlite_version_info >= (3, 34):
+        # Tokenizer trigram: búsqueda por subcadena. Antes de SQLite 3.34 no
+        # existe; sin la tabla la búsqueda usa LIKE
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS inventory_item_fts "
+            "USING fts5(sku, description, tokenize = 'trigram')"
+        )
+        schema_editor.execute(
+            "INSERT INTO inventory_item_fts (rowid, sku, description) "
+            "SELECT id, sku, description FROM inventory_inventoryitem"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS inventoryitem_sku_trgm")
+        schema_editor.execute("DROP INDEX IF EXISTS inventoryitem_description_trgm")
+    elif vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS inventory_item_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0007_purchase_total'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 6.0.1 on 2026-10-17 06:02
+
+from django.db import migrations, models
+
+from apps.common.utils import normalize_name
+
+
+def backfill_normalized_names(apps, schema_editor):
+    for model_name in ("Category", "Supplier"):
+        Model = apps.get_model("inventory", model_name)
+        max_length = Model._meta.get_field("normalized_name").max_length
+        seen = set()
+        rows = []
+        for obj in Model.objects.order_by("pk").only("pk", "name"):
+            normalized = normalize_name(obj.name)
+            # Duplicados previos a la validación: se conservan, marcados por pk
+            # (recortando el nombre para que el sufijo quepa en max_length)
+            if normalized in seen:
+                suffix = f" #{obj.pk}"
+                normalized = normalized[: max_length - len(suffix)] + suffix
+            seen.add(normalized)
+            obj.normalized_name = normalized
+            rows.append(obj)
+        Model.objects.bulk_update(rows, ["normalized_name"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0008_inventoryitem_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='normalized_name',
+            field=models.CharField(editable=False, max_length=80, null=True),
+        ),
+        migrations.AddField(
+            model_name='supplier',
+            name='normalized_name',
+            field=models.CharField(editable=False, max_length=120, null=True),
+        ),
+        migrations.RunPython(backfill_normalized_names, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='category',
+            name='normalized_name',
+            field=models.CharField(editable=False, max_length=80, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='supplier',
+            name='normalized_name',
+            field=models.CharField(editable=False, max_length=120, unique=True),
+        ),
+    ]
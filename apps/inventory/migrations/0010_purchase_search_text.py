@@ -0,0 +1,66 @@
+# Generated by Django 6.0.1 on 2026-10-17 06:48
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+from apps.common.utils import normalize_name
+
+
+def backfill_search_text(apps, schema_editor):
+    Purchase = apps.get_model("inventory", "Purchase")
+    PurchaseLine = apps.get_model("inventory", "PurchaseLine")
+
+    item_texts = defaultdict(dict)
+    for purchase_id, sku, description in (
+        PurchaseLine.objects.order_by("pk")
+        .values_list("purchase_id", "item__sku", "item__description")
+        .iterator()
+    ):
+        item_texts[purchase_id][(sku, description)] = None
+
+    batch = []
+    for pk, ref, supplier_name in (
+        Purchase.objects.order_by("pk").values_list("pk", "ref", "supplier__name").iterator()
+    ):
+        parts = [ref or "", supplier_name or ""]
+        for sku, description in item_texts.get(pk, {}):
+            parts.extend((sku, description))
+        text = " | ".join(normalize_name(part) for part in parts if part)
+        batch.append(Purchase(pk=pk, search_text=text))
+        if len(batch) == 1000:
+            Purchase.objects.bulk_update(batch, ["search_text"])
+            batch = []
+    if batch:
+        Purchase.objects.bulk_update(batch, ["search_text"])
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS purchase_search_trgm "
+            "ON inventory_purchase USING gin (search_text gin_trgm_ops)"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS purchase_search_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0009_normalized_names'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='purchase',
+            name='search_text',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0.1 on 2026-10-17 04:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0010_purchase_search_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inventoryitem',
+            name='is_low_stock',
+            field=models.GeneratedField(db_persist=True, expression=models.ExpressionWrapper(models.Q(('stock__lte', models.F('min_stock'))), output_field=models.BooleanField()), output_field=models.BooleanField()),
+        ),
+        migrations.AddIndex(
+            model_name='inventoryitem',
+            index=models.Index(condition=models.Q(('active', True), ('is_low_stock', True)), fields=['stock'], name='inventoryitem_low_stock_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS category_normalized_name_trgm "
+            "ON inventory_category USING gin (normalized_name gin_trgm_ops)"
+        )
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS supplier_normalized_name_trgm "
+            "ON inventory_supplier USING gin (normalized_name gin_trgm_ops)"
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS category_normalized_name_trgm")
+        schema_editor.execute("DROP INDEX IF EXISTS supplier_normalized_name_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0011_inventoryitem_is_low_stock'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -1,3 +1,4 @@
 from .purchases import Supplier, Purchase, PurchaseLine, PurchasePhoto
 from .inventory import Category, InventoryItem, ItemPhoto
 from .transactions import Requisition, RequisitionLine, InventoryTxn
+from .snapshots import StockSnapshot
@@ -10,6 +10,8 @@ def item_photo_path(instance, filename):
 
 class Category(models.Model):
     name = models.CharField(max_length=80, unique=True)
+    # normalize_name(name): evita duplicados por acentos/mayúsculas con un índice
+    normalized_name = models.CharField(max_length=80, unique=True, editable=False)
     active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -19,19 +21,21 @@ class Category(models.Model):
     def clean(self):
         super().clean()
         if self.name:
-            normalized = normalize_name(self.name)
-            qs = Category.objects.all()
-            if self.pk:
-                qs = qs.exclude(pk=self.pk)
-            for cat in qs:
-                if normalize_name(cat.name) == normalized:
-                    raise ValidationError(
-                        {"name": f'Ya existe una categoría similar: "{cat.name}".'}
-                    )
+            self.normalized_name = normalize_name(self.name)
+            cat = (
+                Category.objects.filter(normalized_name=self.normalized_name)
+                .exclude(pk=self.pk)
+                .first()
+            )
+            if cat:
+                raise ValidationError(
+                    {"name": f'Ya existe una categoría similar: "{cat.name}".'}
+                )
     
     def save(self, *args, **kwargs):
         self.name = " ".join(self.name.split())  # limpiar espacios extra
-        self.full_clean()
+        self.normalized_name = normalize_name(self.name)
+        self.full_clean(exclude=["normalized_name"])
         super().save(*args, **kwargs)
     
     
@@ -48,10 +52,32 @@ class InventoryItem(models.Model):
     
     active = models.BooleanField(default=True)
 
+    # Columna calculada por la base: se mantiene sola en cualquier UPDATE de
+    # stock/min_stock y alimenta el índice parcial de stock bajo
+    is_low_stock = models.GeneratedField(
+        expression=models.ExpressionWrapper(
+            models.Q(stock__lte=models.F("min_stock")),
+            output_field=models.BooleanField(),
+        ),
+        output_field=models.BooleanField(),
+        db_persist=True,
+    )
+
     class Meta:
         indexes = [
             models.Index(fields=["category", "active"]),
             models.Index(fields=["slug"]),
+            models.Index(
+                fields=["stock"],
+                condition=models.Q(active=True, is_low_stock=True),
+                name="inventoryitem_low_stock_idx",
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(stock__gte=0),
+                name="inventoryitem_stock_non_negative",
+            ),
         ]
         
     def __str__(self):
@@ -13,6 +13,8 @@ def purchase_photo_path(instance, filename):
 
 class Supplier(models.Model):
     name = models.CharField("nombre", max_length=120, unique=True)
+    # normalize_name(name): evita duplicados por acentos/mayúsculas con un índice
+    normalized_name = models.CharField(max_length=120, unique=True, editable=False)
     contact_name = models.CharField("contacto principal", max_length=150, blank=True, default="")
     phone = PhoneNumberField("teléfono", blank=True, null=True, region="MX")
     email = models.EmailField("correo electrónico", blank=True, default="")
@@ -33,19 +35,21 @@ class Supplier(models.Model):
     def clean(self):
         super().clean()
         if self.name:
-            normalized = normalize_name(self.name)
-            qs = Supplier.objects.all()
-            if self.pk:
-                qs = qs.exclude(pk=self.pk)
-            for s in qs:
-                if normalize_name(s.name) == normalized:
-                    raise ValidationError(
-                        {"name": f'Ya existe un proveedor similar: "{s.name}".'}
-                    )
+            self.normalized_name = normalize_name(self.name)
+            s = (
+                Supplier.objects.filter(normalized_name=self.normalized_name)
+                .exclude(pk=self.pk)
+                .first()
+            )
+            if s:
+                raise ValidationError(
+                    {"name": f'Ya existe un proveedor similar: "{s.name}".'}
+                )
 
     def save(self, *args, **kwargs):
         self.name = " ".join(self.name.split())
-        self.full_clean()
+        self.normalized_name = normalize_name(self.name)
+        self.full_clean(exclude=["normalized_name"])
         super().save(*args, **kwargs)
 
 
@@ -53,8 +57,17 @@ class Purchase(models.Model):
     supplier = models.ForeignKey(Supplier, on_delete=models.PROTECT, related_name="purchases")
     purchased_at = models.DateField()
     ref = models.CharField(max_length=80, null=True, blank=True)  # folio/factura/OC
+    # Suma de qty * unit_price de las líneas; la mantienen los servicios de compras
+    total = models.DecimalField(max_digits=18, decimal_places=4, default=0)
+    # ref + proveedor + SKU/descripción de las líneas, normalizado; filtro "q" del listado
+    search_text = models.TextField(default="", editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["purchased_at", "id"], name="purchase_list_idx"),
+        ]
+
     def __str__(self):
         return f"Purchase #{self.id} - {self.supplier} - {self.purchased_at}"
 
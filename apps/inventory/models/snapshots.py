@@ -0,0 +1,21 @@
+from django.db import models
+
+from .inventory import InventoryItem
+
+
+class StockSnapshot(models.Model):
+    """Saldo de cierre de un producto al final de un día (hora local)."""
+    item = models.ForeignKey(InventoryItem, on_delete=models.CASCADE, related_name="snapshots")
+    date = models.DateField()
+    stock = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Corte de stock"
+        verbose_name_plural = "Cortes de stock"
+        constraints = [
+            models.UniqueConstraint(fields=["item", "date"], name="stocksnapshot_item_date_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.item_id} @ {self.date}: {self.stock}"
@@ -54,4 +54,5 @@ class InventoryTxn(models.Model):
         indexes = [
             models.Index(fields=["happened_at"]),
             models.Index(fields=["item", "happened_at"]),
+            models.Index(fields=["happened_at", "id"], name="inventorytxn_feed_idx"),
         ]
\ No newline at end of file
@@ -4,6 +4,8 @@ Business logic for category management.
 
 from django.db.models import Count
 
+from apps.common.utils import normalize_name
+
 from ..models.inventory import Category
 
 
@@ -33,5 +35,6 @@ def get_category_list(*, search=""):
     """Return filtered queryset of categories with item counts."""
     qs = Category.objects.annotate(item_count=Count("items")).order_by("name")
     if search:
-        qs = qs.filter(name__icontains=search)
+        # normalized_name covers name case- and accent-insensitively (trigram index on PG)
+        qs = qs.filter(normalized_name__contains=normalize_name(search))
     return qs
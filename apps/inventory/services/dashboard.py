@@ -4,9 +4,12 @@ Dashboard statistics and transaction queries.
 
 from datetime import datetime
 
-from django.db.models import Q, F
+from django.conf import settings
+from django.db.models import Q
 from django.utils import timezone
 
+from apps.common.cache import get_or_compute
+
 from ..models.inventory import InventoryItem
 from ..models.purchases import Purchase
 from ..models.transactions import Requisition, InventoryTxn
@@ -16,16 +19,15 @@ from ..models.transactions import Requisition, InventoryTxn
 # Queries
 # ---------------------------------------------------------------------------
 
-def get_stats(user):
-    """Return dashboard statistics dict based on user role."""
-    now = timezone.now()
-    first_day = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+STATS_VERSIONS = ("inventoryitem", "purchase", "requisition")
 
+
+def _compute_stats(user, first_day):
     if user.is_staff:
         return {
             "total_items": InventoryItem.objects.filter(active=True).count(),
             "low_stock_items": InventoryItem.objects.filter(
-                active=True, stock__lte=F("min_stock")
+                active=True, is_low_stock=True
             ).count(),
             "total_purchases": Purchase.objects.filter(created_at__gte=first_day).count(),
             "total_requisitions": Requisition.objects.filter(created_at__gte=first_day).count(),
@@ -41,13 +43,37 @@ def get_stats(user):
     }
 
 
+def get_stats(user):
+    """
+    Return dashboard statistics dict based on user role.
+
+    Cached per month and audience (staff, or the requesting user) under the
+    ``inventoryitem`` / ``purchase`` / ``requisition`` versions, which the
+    signals and the stock engine bump on every change.
+    """
+    now = timezone.now()
+    first_day = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    audience = "staff" if user.is_staff else f"user{user.pk}"
+    return get_or_compute(
+        f"dashboard:stats:{audience}:{first_day:%Y-%m}",
+        lambda: _compute_stats(user, first_day),
+        versions=STATS_VERSIONS,
+        timeout=getattr(settings, "DASHBOARD_STATS_TTL", 300),
+    )
+
+
 def get_low_stock_items(user):
-    """Return low-stock items (admin only)."""
+    """
+    Return low-stock items (admin only).
+
+    Reads the ``inventoryitem_low_stock_idx`` partial index through the
+    generated ``is_low_stock`` column instead of scanning the catalog.
+    """
     if not user.is_staff:
         return InventoryItem.objects.none()
     return (
         InventoryItem.objects
-        .filter(active=True, stock__lte=F("min_stock"))
+        .filter(active=True, is_low_stock=True)
         .select_related("category")
         .order_by("stock")[:10]
     )
@@ -85,4 +111,4 @@ def filter_transactions(qs, *, item_filter="", date_from="", date_to=""):
             qs = qs.filter(happened_at__lte=dt)
         except ValueError:
             pass
-    return qs.order_by("-happened_at")
+    return qs.order_by("-happened_at", "-id")
@@ -6,11 +6,29 @@ keyword-only arguments so callers are explicit about every field.
 """
 
 from django.db import transaction
-from django.db.models import Q
 from django.utils import timezone
 
-from ..models.inventory import Category, InventoryItem, ItemPhoto
+from ..models.inventory import Category, InventoryItem
 from ..models.transactions import InventoryTxn
+from . import photos as photo_svc
+from . import purchases as purchase_svc
+from . import search as search_svc
+from . import stock as stock_svc
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _adjust_txn(item, qty, *, note=""):
+    """Return an unsaved ADJUST ``InventoryTxn`` for ``item``."""
+    return InventoryTxn(
+        item=item,
+        txn_type=InventoryTxn.TXN_ADJUST,
+        qty=qty,
+        happened_at=timezone.now(),
+        note=note,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -30,7 +48,7 @@ def create_item(
     photos=None,
 ):
     """Create a new inventory item with optional photos."""
-    with transaction.atomic():
+    with photo_svc.staged_item_photos(photos) as staged, transaction.atomic():
         item = InventoryItem.objects.create(
             sku=sku,
             slug=slug,
@@ -41,8 +59,9 @@ def create_item(
             max_stock=max_stock,
             active=active,
         )
-        for photo in photos or []:
-            ItemPhoto.objects.create(item=item, image=photo)
+        if stock:
+            stock_svc.record_txns([_adjust_txn(item, stock, note="Stock inicial")])
+        photo_svc.attach_item_photos(item, staged)
     return item
 
 
@@ -59,34 +78,58 @@ def update_item(
     active,
     photos=None,
 ):
-    """Update an existing inventory item and optionally add new photos."""
-    with transaction.atomic():
+    """
+    Update an existing inventory item and optionally add new photos.
+
+    A changed ``stock`` is not written directly: the difference is applied
+    as a conditional delta and recorded as an ADJUST transaction so the
+    ledger keeps matching the stored stock. Renaming the SKU or description
+    refreshes the search text of the purchases that reference the item.
+    Photos are uploaded before the transaction opens.
+    """
+    with photo_svc.staged_item_photos(photos) as staged, transaction.atomic():
+        delta = stock - item.stock
+        renamed = (item.sku, item.description) != (sku, description)
         item.sku = sku
         item.slug = slug
         item.category_id = category_id
         item.description = description
-        item.stock = stock
         item.min_stock = min_stock
         item.max_stock = max_stock
         item.active = active
-        item.save()
-        for photo in photos or []:
-            ItemPhoto.objects.create(item=item, image=photo)
+        item.save(update_fields=[
+            "sku", "slug", "category", "description", "min_stock", "max_stock", "active",
+        ])
+        if delta:
+            if not stock_svc.apply_stock_delta(item.pk, delta):
+                item.refresh_from_db(fields=["stock"])
+                raise stock_svc.InsufficientStockError([(item, -delta)])
+            stock_svc.record_txns([
+                _adjust_txn(item, delta, note="Ajuste desde edición de producto")
+            ])
+            item.refresh_from_db(fields=["stock"])
+        if renamed:
+            purchase_svc.refresh_search_text(
+                item.purchase_lines.values_list("purchase_id", flat=True)
+                .distinct().order_by("purchase_id").iterator()
+            )
+        photo_svc.attach_item_photos(item, staged)
     return item
 
 
 def adjust_stock(item, *, qty, note=""):
-    """Adjust stock level and record an ADJUST transaction."""
+    """
+    Adjust stock level and record an ADJUST transaction.
+
+    Uses a conditional ``UPDATE`` instead of ``item.save()`` so concurrent
+    adjustments neither lose updates nor serialize on a row lock.
+    """
     with transaction.atomic():
-        item.stock += qty
-        item.save()
-        InventoryTxn.objects.create(
-            item=item,
-            txn_type=InventoryTxn.TXN_ADJUST,
-            qty=qty,
-            happened_at=timezone.now(),
-            note=note,
-        )
+        if not stock_svc.apply_stock_delta(item.pk, qty):
+            item.refresh_from_db(fields=["stock"])
+            raise stock_svc.InsufficientStockError([(item, -qty)])
+        stock_svc.record_txns([_adjust_txn(item, qty, note=note)])
+    item.refresh_from_db(fields=["stock"])
     return item
 
 
@@ -102,10 +145,25 @@ def get_inventory_list(*, search="", category_id=""):
         .select_related("category")
         .prefetch_related("photos")
     )
-    if search:
-        qs = qs.filter(
-            Q(sku__icontains=search) | Q(description__icontains=search)
-        )
     if category_id:
         qs = qs.filter(category_id=category_id)
+    if search:
+        qs = search_svc.search_items(qs, search)
+        return qs.order_by("search_rank", "sku")
     return qs.order_by("sku")
+
+
+def lookup_items(*, q="", limit=20):
+    """
+    Return up to ``limit`` active items matching ``q`` for typeahead widgets.
+
+    Exact and prefix SKU matches come first (see ``search.search_items``);
+    only the columns the widgets render are fetched.
+    """
+    qs = InventoryItem.objects.filter(active=True)
+    q = q.strip()
+    if q:
+        qs = search_svc.search_items(qs, q).order_by("search_rank", "sku")
+    else:
+        qs = qs.order_by("sku")
+    return list(qs.values("id", "sku", "description", "stock")[:limit])
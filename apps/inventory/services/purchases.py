@@ -7,13 +7,21 @@ by pairing every stock change with an ``InventoryTxn`` record.
 
 import json
 import re
+from collections import defaultdict
+from decimal import Decimal
 
 from django.db import transaction
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-from ..models.inventory import InventoryItem
-from ..models.purchases import Purchase, PurchaseLine, PurchasePhoto
+from apps.common.utils import chunked, normalize_name
+
+from ..models.purchases import Purchase, PurchaseLine
 from ..models.transactions import InventoryTxn
+from . import photos as photo_svc
+from . import snapshots as snapshot_svc
+from . import stock as stock_svc
 
 
 # ---------------------------------------------------------------------------
@@ -46,96 +54,227 @@ def _validate_lines(lines_data, *, require_price=True):
     return valid
 
 
+def _build_lines(purchase, valid_lines):
+    """Return unsaved ``PurchaseLine`` objects for the validated form lines."""
+    return [
+        PurchaseLine(
+            purchase=purchase,
+            item_id=int(ld["item"]),
+            qty=int(ld["qty"]),
+            unit_price=Decimal(ld["unit_price"]),
+        )
+        for ld in valid_lines
+    ]
+
+
+def _lines_total(lines):
+    """Return the sum of ``qty * unit_price`` for ``lines``."""
+    return sum((line.qty * line.unit_price for line in lines), Decimal("0"))
+
+
+def _build_txn(purchase, line, *, happened_at, note):
+    """Return an unsaved PURCHASE ``InventoryTxn`` mirroring ``line``."""
+    return InventoryTxn(
+        item_id=line.item_id,
+        txn_type=InventoryTxn.TXN_PURCHASE,
+        qty=line.qty,
+        unit_price=line.unit_price,
+        supplier_id=purchase.supplier_id,
+        purchase=purchase,
+        happened_at=happened_at,
+        note=note,
+    )
+
+
+def _post_lines(purchase, lines, *, note):
+    """
+    Post purchase lines in bulk: lock items, write lines, bump stock, record txns.
+
+    Costs a constant number of queries regardless of the number of lines.
+    """
+    stock_svc.lock_items(line.item_id for line in lines)
+
+    PurchaseLine.objects.bulk_create(lines)
+    stock_svc.apply_stock_deltas(
+        stock_svc.aggregate_deltas((line.item_id, line.qty) for line in lines)
+    )
+
+    happened_at = timezone.now()
+    stock_svc.record_txns([
+        _build_txn(purchase, line, happened_at=happened_at, note=note)
+        for line in lines
+    ])
+    return lines
+
+
+def _search_document(ref, supplier_name, item_texts):
+    """
+    Build the normalized search text of a purchase.
+
+    ``item_texts`` is an iterable of ``(sku, description)`` for its lines;
+    repeated items appear once.
+    """
+    parts = [ref or "", supplier_name or ""]
+    for sku, description in dict.fromkeys(item_texts):
+        parts.extend((sku, description))
+    return " | ".join(normalize_name(part) for part in parts if part)
+
+
+def _pair_lines(old_lines, new_lines):
+    """
+    Match stored and submitted lines of the same item by position.
+
+    Yields ``(old, new)`` tuples where either side may be ``None`` for lines
+    that were removed or added.
+    """
+    pending = defaultdict(list)
+    for line in old_lines:
+        pending[line.item_id].append(line)
+    for new in new_lines:
+        bucket = pending.get(new.item_id)
+        yield (bucket.pop(0) if bucket else None), new
+    for bucket in pending.values():
+        for old in bucket:
+            yield old, None
+
+
 # ---------------------------------------------------------------------------
 # Commands (write)
 # ---------------------------------------------------------------------------
 
 def create_purchase(*, supplier_id, purchased_at, ref="", lines_data, photos=None):
-    """Create a purchase, update stock, record transactions, attach photos."""
-    valid_lines = _validate_lines(lines_data)
+    """
+    Create a purchase, update stock, record transactions, attach photos.
 
-    with transaction.atomic():
-        purchase = Purchase.objects.create(
-            supplier_id=supplier_id,
-            purchased_at=purchased_at,
-            ref=ref,
-        )
+    Photos are uploaded before the transaction opens.
+    """
+    valid_lines = _validate_lines(lines_data)
 
-        for ld in valid_lines:
-            item = InventoryItem.objects.select_for_update().get(pk=ld["item"])
-            qty = int(ld["qty"])
-            unit_price = float(ld["unit_price"])
+    with photo_svc.staged_purchase_photos(photos) as staged, transaction.atomic():
+        purchase = Purchase(supplier_id=supplier_id, purchased_at=purchased_at, ref=ref)
+        lines = _build_lines(purchase, valid_lines)
+        purchase.total = _lines_total(lines)
+        purchase.save()
 
-            PurchaseLine.objects.create(
-                purchase=purchase, item=item, qty=qty, unit_price=unit_price,
-            )
-            item.stock += qty
-            item.save()
-
-            InventoryTxn.objects.create(
-                item=item,
-                txn_type=InventoryTxn.TXN_PURCHASE,
-                qty=qty,
-                unit_price=unit_price,
-                supplier=purchase.supplier,
-                purchase=purchase,
-                happened_at=timezone.now(),
-                note=f"Compra #{purchase.id}",
-            )
+        _post_lines(purchase, lines, note=f"Compra #{purchase.id}")
+        refresh_search_text([purchase.pk])
 
-        for photo in photos or []:
-            PurchasePhoto.objects.create(purchase=purchase, image=photo)
+        photo_svc.attach_purchase_photos(purchase, staged)
 
     return purchase
 
 
 def update_purchase(purchase, *, supplier_id, purchased_at, ref="", lines_data, photos=None):
-    """Revert original stock, delete old lines/txns, apply new ones, attach photos."""
+    """
+    Update header, diff lines against the stored ones, attach photos.
+
+    Stock is only touched for items whose net quantity changed; unchanged
+    lines and their ``InventoryTxn`` rows are left alone, edited ones are
+    updated in place and added/removed ones are created/deleted in bulk.
+    The purchase row is locked before its lines are read. Photos are
+    uploaded before the transaction opens, so no lock is held during PUTs.
+    """
     valid_lines = _validate_lines(lines_data)
 
-    with transaction.atomic():
-        # 1) Revert stock from original lines
-        for line in purchase.lines.select_related("item"):
-            item = InventoryItem.objects.select_for_update().get(pk=line.item_id)
-            item.stock -= line.qty
-            item.save()
-
-        # 2) Delete old transactions and lines
-        InventoryTxn.objects.filter(purchase=purchase).delete()
-        purchase.lines.all().delete()
-
-        # 3) Update header
+    with photo_svc.staged_purchase_photos(photos) as staged, transaction.atomic():
+        # Lock the purchase first: concurrent edits of the same purchase
+        # serialize here, and each one diffs against the lines (and header)
+        # the previous one committed instead of applying its deltas twice
+        locked = Purchase.objects.select_for_update().get(pk=purchase.pk)
+        purchase.supplier_id, purchase.ref = locked.supplier_id, locked.ref
+        old_lines = list(purchase.lines.order_by("pk"))
+        new_lines = _build_lines(purchase, valid_lines)
+
+        # 1) Net per-item delta; lock only the items that actually move
+        deltas = stock_svc.aggregate_deltas(
+            [(line.item_id, -line.qty) for line in old_lines]
+            + [(line.item_id, line.qty) for line in new_lines]
+        )
+        deltas = {pk: delta for pk, delta in deltas.items() if delta}
+        stock_svc.lock_items(deltas.keys())
+
+        # 2) Update header (and the supplier denormalized on the ledger)
+        supplier_changed = str(purchase.supplier_id) != str(supplier_id)
+        document_changed = (
+            supplier_changed
+            or (purchase.ref or "") != (ref or "")
+            or {line.item_id for line in old_lines} != {line.item_id for line in new_lines}
+        )
         purchase.supplier_id = supplier_id
         purchase.purchased_at = purchased_at
         purchase.ref = ref
+        purchase.total = _lines_total(new_lines)
         purchase.save()
-
-        # 4) Create new lines
-        for ld in valid_lines:
-            item = InventoryItem.objects.select_for_update().get(pk=ld["item"])
-            qty = int(ld["qty"])
-            unit_price = float(ld["unit_price"])
-
-            PurchaseLine.objects.create(
-                purchase=purchase, item=item, qty=qty, unit_price=unit_price,
-            )
-            item.stock += qty
-            item.save()
-
-            InventoryTxn.objects.create(
-                item=item,
-                txn_type=InventoryTxn.TXN_PURCHASE,
-                qty=qty,
-                unit_price=unit_price,
-                supplier=purchase.supplier,
-                purchase=purchase,
-                happened_at=timezone.now(),
-                note=f"Compra #{purchase.id} (editada)",
-            )
-
-        # 5) Attach new photos
-        for photo in photos or []:
-            PurchasePhoto.objects.create(purchase=purchase, image=photo)
+        if supplier_changed:
+            InventoryTxn.objects.filter(purchase=purchase).update(supplier_id=supplier_id)
+
+        # 3) Map each stored line to its ledger row (same item, same order)
+        txns_by_item = defaultdict(list)
+        for txn in InventoryTxn.objects.filter(purchase=purchase).order_by("pk"):
+            txns_by_item[txn.item_id].append(txn)
+        txn_for = {}
+        for line in old_lines:
+            bucket = txns_by_item.get(line.item_id)
+            txn_for[line.pk] = bucket.pop(0) if bucket else None
+
+        # 4) Diff lines
+        happened_at = timezone.now()
+        note = f"Compra #{purchase.id} (editada)"
+        lines_to_update, lines_to_create, lines_to_delete = [], [], []
+        txns_to_update, txns_to_create, txns_to_delete = [], [], []
+        moved = []  # (item_id, happened_at, qty) for in-place edits/removals
+
+        for old, new in _pair_lines(old_lines, new_lines):
+            if old is None:
+                lines_to_create.append(new)
+                txns_to_create.append(
+                    _build_txn(purchase, new, happened_at=happened_at, note=note)
+                )
+                continue
+
+            txn = txn_for[old.pk]
+            if new is None:
+                lines_to_delete.append(old.pk)
+                if txn is not None:
+                    txns_to_delete.append(txn.pk)
+                    moved.append((txn.item_id, txn.happened_at, -txn.qty))
+                continue
+
+            if old.qty == new.qty and old.unit_price == new.unit_price:
+                continue
+            old.qty, old.unit_price = new.qty, new.unit_price
+            lines_to_update.append(old)
+            if txn is None:
+                txns_to_create.append(
+                    _build_txn(purchase, old, happened_at=happened_at, note=note)
+                )
+            else:
+                moved.append((txn.item_id, txn.happened_at, old.qty - txn.qty))
+                txn.qty, txn.unit_price, txn.note = old.qty, old.unit_price, note
+                txns_to_update.append(txn)
+
+        if lines_to_delete:
+            PurchaseLine.objects.filter(pk__in=lines_to_delete).delete()
+        if lines_to_update:
+            PurchaseLine.objects.bulk_update(lines_to_update, ["qty", "unit_price"])
+        if lines_to_create:
+            PurchaseLine.objects.bulk_create(lines_to_create)
+
+        if txns_to_delete:
+            InventoryTxn.objects.filter(pk__in=txns_to_delete).delete()
+        if txns_to_update:
+            InventoryTxn.objects.bulk_update(txns_to_update, ["qty", "unit_price", "note"])
+        if txns_to_create:
+            stock_svc.record_txns(txns_to_create)
+        snapshot_svc.sync_snapshots(moved)
+
+        # 5) Apply the net stock change
+        stock_svc.apply_stock_deltas(deltas)
+        if document_changed:
+            refresh_search_text([purchase.pk])
+
+        # 6) Attach new photos
+        photo_svc.attach_purchase_photos(purchase, staged)
 
     return purchase
 
@@ -143,17 +282,71 @@ def update_purchase(purchase, *, supplier_id, purchased_at, ref="", lines_data,
 def delete_purchase(purchase):
     """Revert stock and delete purchase (CASCADE removes lines, photos, txns)."""
     with transaction.atomic():
-        for line in purchase.lines.select_related("item"):
-            item = InventoryItem.objects.select_for_update().get(pk=line.item_id)
-            item.stock -= line.qty
-            item.save()
+        deltas = stock_svc.aggregate_deltas(
+            (item_id, -qty) for item_id, qty in purchase.lines.values_list("item_id", "qty")
+        )
+        stock_svc.lock_items(deltas.keys())
+        stock_svc.apply_stock_deltas(deltas)
+        snapshot_svc.sync_snapshots(
+            (item_id, happened_at, -qty)
+            for item_id, happened_at, qty in InventoryTxn.objects.filter(purchase=purchase)
+            .values_list("item_id", "happened_at", "qty")
+        )
         purchase.delete()
 
 
+def refresh_totals():
+    """
+    Recompute ``Purchase.total`` of every purchase from its lines.
+
+    For bulk loads that bypass the services (``loaddata`` in ``restore_db`` /
+    ``seed_db``). One ``UPDATE`` with a correlated subquery.
+    """
+    amount = DecimalField(max_digits=18, decimal_places=4)
+    line_totals = (
+        PurchaseLine.objects.filter(purchase=OuterRef("pk"))
+        .values("purchase")
+        .annotate(total=Sum(F("qty") * F("unit_price"), output_field=amount))
+        .values("total")
+    )
+    return Purchase.objects.update(
+        total=Coalesce(Subquery(line_totals, output_field=amount), 0, output_field=amount)
+    )
+
+
+def refresh_search_text(purchase_ids, *, chunk_size=500):
+    """
+    Rebuild ``Purchase.search_text`` for ``purchase_ids``.
+
+    Called after a purchase is posted or edited and when a supplier or item
+    referenced by purchases is renamed. Costs three queries per chunk.
+    """
+    for chunk in chunked(purchase_ids, chunk_size):
+        item_texts = defaultdict(list)
+        for purchase_id, sku, description in (
+            PurchaseLine.objects.filter(purchase_id__in=chunk)
+            .order_by("pk")
+            .values_list("purchase_id", "item__sku", "item__description")
+        ):
+            item_texts[purchase_id].append((sku, description))
+        purchases = [
+            Purchase(pk=pk, search_text=_search_document(ref, supplier_name, item_texts[pk]))
+            for pk, ref, supplier_name in (
+                Purchase.objects.filter(pk__in=chunk).values_list("pk", "ref", "supplier__name")
+            )
+        ]
+        Purchase.objects.bulk_update(purchases, ["search_text"])
+
+
 # ---------------------------------------------------------------------------
 # Queries (read)
 # ---------------------------------------------------------------------------
 
+def filter_purchases(qs, *, q):
+    """Filter purchases by ``q`` against the stored search document."""
+    return qs.filter(search_text__contains=normalize_name(q))
+
+
 def get_purchase_detail(purchase):
     """Enrich purchase with lines subtotals and total; returns purchase."""
     lines = list(purchase.lines.select_related("item").all())
@@ -0,0 +1,106 @@
+"""
+Ledger reconciliation: compare ``InventoryItem.stock`` with ``InventoryTxn``.
+
+Items are streamed in primary-key chunks and each chunk is compared against
+one grouped ``SUM(qty)`` over its ledger rows, so memory stays bounded no
+matter how large the ledger grows.
+"""
+
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from apps.common.utils import chunked
+
+from ..models.inventory import InventoryItem
+from ..models.transactions import InventoryTxn
+from .snapshots import shift_snapshots_before
+
+
+# ---------------------------------------------------------------------------
+# Queries (read)
+# ---------------------------------------------------------------------------
+
+def _ledger_totals(item_ids):
+    """Return ``{item_id: sum(qty)}`` of the ledger rows of ``item_ids``."""
+    return dict(
+        InventoryTxn.objects.filter(item_id__in=item_ids)
+        .values("item_id")
+        .annotate(total=Sum("qty"))
+        .values_list("item_id", "total")
+    )
+
+
+def iter_drift(*, chunk_size=5000):
+    """
+    Yield ``(item_id, sku, stock, ledger_total)`` for every drifted item.
+
+    An item drifts when its stored stock differs from the sum of its ledger.
+    Rows are read without locks, so a document committing in between can
+    show up as drift; ``post_corrections`` re-checks under a lock.
+    """
+    rows = (
+        InventoryItem.objects.order_by("pk")
+        .values_list("pk", "sku", "stock")
+        .iterator(chunk_size=chunk_size)
+    )
+    for chunk in chunked(rows, chunk_size):
+        totals = _ledger_totals([pk for pk, _, _ in chunk])
+        for pk, sku, stock in chunk:
+            ledger = totals.get(pk, 0)
+            if stock != ledger:
+                yield pk, sku, stock, ledger
+
+
+# ---------------------------------------------------------------------------
+# Commands (write)
+# ---------------------------------------------------------------------------
+
+def post_corrections(drifts, *, note="Conciliación de stock", batch_size=1000):
+    """
+    Post ADJUST rows so each drifted item's ledger matches its stored stock.
+
+    ``drifts`` is an iterable as produced by ``iter_drift``. Each chunk of
+    items is locked (pk order, like the posting services) and its stock and
+    ledger re-read under the lock; only items that still differ get a row,
+    so a document that committed after ``iter_drift`` is not "corrected".
+
+    Stock itself is left untouched (it is the physical truth), so the rows
+    bypass ``stock.record_txns``. Snapshots are anchored on stored stock,
+    which already includes the drift: those dated before the adjustment day
+    are shifted back by each correction in the same transaction, otherwise
+    ``get_stock_as_of`` would count it twice. Returns the number of rows
+    posted.
+    """
+    posted = 0
+    happened_at = timezone.now()
+    day = timezone.localdate(happened_at)
+    for chunk in chunked(drifts, batch_size):
+        with transaction.atomic():
+            stocks = dict(
+                InventoryItem.objects.select_for_update()
+                .filter(pk__in=[pk for pk, _, _, _ in chunk])
+                .order_by("pk")
+                .values_list("pk", "stock")
+            )
+            totals = _ledger_totals(stocks.keys())
+            corrections = {
+                pk: stock - totals.get(pk, 0)
+                for pk, stock in stocks.items()
+                if stock != totals.get(pk, 0)
+            }
+            if not corrections:
+                continue
+            InventoryTxn.objects.bulk_create([
+                InventoryTxn(
+                    item_id=pk,
+                    txn_type=InventoryTxn.TXN_ADJUST,
+                    qty=qty,
+                    happened_at=happened_at,
+                    note=note,
+                )
+                for pk, qty in corrections.items()
+            ])
+            shift_snapshots_before({pk: -qty for pk, qty in corrections.items()}, day)
+        posted += len(corrections)
+    return posted
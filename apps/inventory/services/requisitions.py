@@ -1,15 +1,18 @@
 """
 Business logic for requisitions with stock validation.
 
-Each requisition line reduces stock and records an ISSUE transaction.
+Each requisition line reduces stock and records an ISSUE transaction. All
+requested items are locked up front in primary-key order and validated
+together, so concurrent requisitions cannot deadlock and the user sees
+every shortage at once.
 """
 
 from django.db import transaction
 from django.utils import timezone
 
-from ..models.inventory import InventoryItem
 from ..models.transactions import Requisition, RequisitionLine, InventoryTxn
 from .purchases import _validate_lines
+from . import stock as stock_svc
 
 
 # ---------------------------------------------------------------------------
@@ -19,37 +22,36 @@ from .purchases import _validate_lines
 def create_requisition(*, user, requested_at, note="", lines_data):
     """Create a requisition, validate & reduce stock, record transactions."""
     valid_lines = _validate_lines(lines_data, require_price=False)
+    requested = [(int(ld["item"]), int(ld["qty"])) for ld in valid_lines]
+    totals = stock_svc.aggregate_deltas(requested)
 
     with transaction.atomic():
+        items = stock_svc.lock_items(totals.keys())
+        stock_svc.check_availability(items, totals)
+
         requisition = Requisition.objects.create(
             requested_by=user,
             requested_at=requested_at,
             note=note,
         )
 
-        for ld in valid_lines:
-            item = InventoryItem.objects.select_for_update().get(pk=ld["item"])
-            qty = int(ld["qty"])
-
-            if item.stock < qty:
-                raise ValueError(
-                    f"Stock insuficiente para {item.sku}. "
-                    f"Disponible: {item.stock}, Solicitado: {qty}"
-                )
-
-            RequisitionLine.objects.create(
-                requisition=requisition, item=item, qty=qty,
-            )
-            item.stock -= qty
-            item.save()
+        RequisitionLine.objects.bulk_create([
+            RequisitionLine(requisition=requisition, item_id=item_id, qty=qty)
+            for item_id, qty in requested
+        ])
+        stock_svc.apply_stock_deltas({pk: -qty for pk, qty in totals.items()})
 
-            InventoryTxn.objects.create(
-                item=item,
+        happened_at = timezone.now()
+        stock_svc.record_txns([
+            InventoryTxn(
+                item_id=item_id,
                 txn_type=InventoryTxn.TXN_ISSUE,
                 qty=-qty,
                 requisition=requisition,
-                happened_at=timezone.now(),
+                happened_at=happened_at,
                 note=f"Requisición #{requisition.id}",
             )
+            for item_id, qty in requested
+        ])
 
     return requisition
@@ -0,0 +1,186 @@
+"""
+Search backend for ``InventoryItem`` (SKU and description).
+
+Both backends do case-insensitive substring matching on either column.
+PostgreSQL serves the ``icontains`` predicate from ``pg_trgm`` GIN indexes
+on ``UPPER(sku)`` / ``UPPER(description)``. The SQLite development database
+uses an FTS5 shadow table (``inventory_item_fts``, ``trigram`` tokenizer)
+where the whole search is one phrase, i.e. a substring; it is kept in sync
+by the ``InventoryItem`` save/delete signals. Searches shorter than three
+characters (no trigram to match) fall back to ``icontains``. Both backends
+rank exact and prefix SKU matches first, then description prefixes.
+
+Barcode scans use ``get_item_by_sku``: an exact lookup on the unique
+``sku`` index behind a small per-process LRU, evicted when an item is saved
+or its stock moves.
+"""
+
+import logging
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+from apps.common.lru import LRUCache
+
+from ..models.inventory import InventoryItem
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "inventory_item_fts"
+
+SCAN_FIELDS = ("id", "sku", "description", "stock", "min_stock")
+
+_fts_ready = {}  # alias -> bool, checked once per process
+
+# sku -> dict(SCAN_FIELDS); the TTL bounds staleness across worker processes
+_scan_cache = LRUCache(
+    maxsize=getattr(settings, "SCAN_CACHE_SIZE", 1024),
+    ttl=getattr(settings, "SCAN_CACHE_TTL", 5),
+)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _has_fts(alias):
+    """Return ``True`` if the SQLite FTS5 shadow table exists for ``alias``."""
+    if alias not in _fts_ready:
+        connection = connections[alias]
+        ready = False
+        if connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                    [FTS_TABLE],
+                )
+                ready = cursor.fetchone() is not None
+        _fts_ready[alias] = ready
+    return _fts_ready[alias]
+
+
+def _fts_expression(search):
+    """
+    Turn free text into a trigram FTS5 query matching it as a substring.
+
+    Returns ``""`` for searches under three characters, which a trigram
+    index cannot answer.
+    """
+    if len(search) < 3:
+        return ""
+    return '"{}"'.format(search.replace('"', '""'))
+
+
+def _rank(search):
+    return Case(
+        When(sku__iexact=search, then=Value(0)),
+        When(sku__istartswith=search, then=Value(1)),
+        When(description__istartswith=search, then=Value(2)),
+        default=Value(3),
+        output_field=IntegerField(),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Queries (read)
+# ---------------------------------------------------------------------------
+
+def search_items(qs, search):
+    """
+    Filter an ``InventoryItem`` queryset by ``search`` and annotate ``search_rank``.
+
+    Callers should order by ``("search_rank", "sku")``.
+    """
+    search = search.strip()
+    if not search:
+        return qs.annotate(search_rank=Value(0, output_field=IntegerField()))
+
+    expression = _fts_expression(search)
+    if expression and _has_fts(qs.db):
+        matches = RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [expression]
+        )
+        qs = qs.filter(pk__in=matches)
+    else:
+        qs = qs.filter(Q(sku__icontains=search) | Q(description__icontains=search))
+    return qs.annotate(search_rank=_rank(search))
+
+
+def get_item_by_sku(sku):
+    """
+    Return ``SCAN_FIELDS`` of the active item with exactly ``sku``, or ``None``.
+
+    Hits are cached per process; misses are not, so a newly created item is
+    found on its first scan.
+    """
+    sku = sku.strip()
+    if not sku:
+        return None
+    item = _scan_cache.get(sku)
+    if item is None:
+        item = InventoryItem.objects.filter(sku=sku, active=True).values(*SCAN_FIELDS).first()
+        if item is None:
+            return None
+        _scan_cache.set(sku, item)
+    return dict(item)
+
+
+def invalidate_scan_cache(item_ids):
+    """
+    Drop cached scans of ``item_ids``, now and again when the transaction commits.
+
+    The second pass discards values re-read by other requests before commit.
+    """
+    item_ids = set(item_ids)
+    if not item_ids:
+        return
+
+    def evict():
+        _scan_cache.evict(lambda sku, item: item["id"] in item_ids)
+
+    evict()
+    transaction.on_commit(evict)
+
+
+# ---------------------------------------------------------------------------
+# Index maintenance (SQLite FTS5; no-ops elsewhere)
+# ---------------------------------------------------------------------------
+
+def index_item(item, *, using="default"):
+    """Insert or refresh ``item`` in the FTS5 shadow table."""
+    if not _has_fts(using):
+        return
+    try:
+        with connections[using].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [item.pk])
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, sku, description) VALUES (%s, %s, %s)",
+                [item.pk, item.sku, item.description],
+            )
+    except DatabaseError as exc:
+        logger.warning("No se pudo indexar el producto %s: %s", item.pk, exc)
+
+
+def unindex_item(pk, *, using="default"):
+    """Remove item ``pk`` from the FTS5 shadow table."""
+    if not _has_fts(using):
+        return
+    try:
+        with connections[using].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [pk])
+    except DatabaseError as exc:
+        logger.warning("No se pudo quitar del índice el producto %s: %s", pk, exc)
+
+
+def rebuild_index(*, using="default"):
+    """Repopulate the FTS5 shadow table from ``inventory_inventoryitem``."""
+    if not _has_fts(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, sku, description) "
+            "SELECT id, sku, description FROM inventory_inventoryitem"
+        )
@@ -0,0 +1,183 @@
+"""
+Daily stock snapshots for point-in-time stock queries.
+
+``StockSnapshot`` stores an item's closing balance at the end of a local
+day. Snapshots are written incrementally by the ``snapshot_stock`` command
+(a full baseline on the first run, then only items with ledger activity)
+and kept in sync by the posting services whenever a ledger row lands on or
+before an already snapshotted date. ``get_stock_as_of`` answers from the
+nearest snapshot plus a small ledger delta, independent of ledger size.
+"""
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db.models import Case, F, IntegerField, Max, Sum, When
+from django.utils import timezone
+
+from apps.common.utils import chunked
+
+from ..models.inventory import InventoryItem
+from ..models.snapshots import StockSnapshot
+from ..models.transactions import InventoryTxn
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def end_of_day(day):
+    """Return the aware datetime where local ``day`` ends (next midnight)."""
+    return timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+
+
+def _ledger_sum(item_id, *, start=None, end=None):
+    """Sum ``InventoryTxn.qty`` for one item in ``[start, end)``."""
+    qs = InventoryTxn.objects.filter(item_id=item_id)
+    if start is not None:
+        qs = qs.filter(happened_at__gte=start)
+    if end is not None:
+        qs = qs.filter(happened_at__lt=end)
+    return qs.aggregate(total=Sum("qty"))["total"] or 0
+
+
+def _sums_after(item_ids, moment):
+    """Return ``{item_id: sum(qty)}`` of ledger rows at or after ``moment``."""
+    return dict(
+        InventoryTxn.objects.filter(item_id__in=item_ids, happened_at__gte=moment)
+        .values("item_id")
+        .annotate(total=Sum("qty"))
+        .values_list("item_id", "total")
+    )
+
+
+# ---------------------------------------------------------------------------
+# Commands (write)
+# ---------------------------------------------------------------------------
+
+def sync_snapshots(entries):
+    """
+    Shift existing snapshots for ledger rows posted on already closed days.
+
+    ``entries`` is an iterable of ``(item_id, happened_at, qty)``. Issues one
+    ``UPDATE`` per distinct local date; rows posted after the latest
+    snapshot (the usual case) touch nothing.
+    """
+    by_date = defaultdict(lambda: defaultdict(int))
+    for item_id, happened_at, qty in entries:
+        if qty:
+            by_date[timezone.localdate(happened_at)][item_id] += qty
+
+    for day, deltas in by_date.items():
+        _shift(deltas, date__gte=day)
+
+
+def shift_snapshots_before(deltas, day):
+    """
+    Add ``{item_id: delta}`` to every snapshot dated before local ``day``.
+
+    For ledger rows that correct the ledger rather than move stock (see
+    ``reconciliation.post_corrections``): snapshots anchored on stored stock
+    already include the correction, so the earlier ones must give it back.
+    """
+    _shift(deltas, date__lt=day)
+
+
+def _shift(deltas, **date_filter):
+    """Add ``{item_id: delta}`` to the snapshots matching ``date_filter``."""
+    deltas = {pk: delta for pk, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    StockSnapshot.objects.filter(item_id__in=deltas.keys(), **date_filter).update(
+        stock=Case(
+            *(When(item_id=pk, then=F("stock") + delta) for pk, delta in deltas.items()),
+            default=F("stock"),
+            output_field=IntegerField(),
+        )
+    )
+
+
+def take_snapshots(*, until, chunk_size=2000):
+    """
+    Write closing balances up to local date ``until`` (inclusive).
+
+    The first run snapshots every item at ``until``; later runs add, for each
+    day after the latest snapshot, a row for the items with ledger activity
+    that day. Balances are anchored on the current stock
+    (``stock - ledger after the day``) and items are processed in chunks so
+    memory stays bounded. Returns the number of rows written.
+    """
+    last = StockSnapshot.objects.aggregate(last=Max("date"))["last"]
+    if last is None:
+        days = [(until, InventoryItem.objects.order_by("pk").values_list("pk", flat=True))]
+    else:
+        days = []
+        day = last + timedelta(days=1)
+        while day <= until:
+            active = (
+                InventoryTxn.objects.filter(
+                    happened_at__gte=end_of_day(day - timedelta(days=1)),
+                    happened_at__lt=end_of_day(day),
+                )
+                .order_by("item_id")
+                .values_list("item_id", flat=True)
+                .distinct()
+            )
+            days.append((day, active))
+            day += timedelta(days=1)
+
+    written = 0
+    for day, item_ids in days:
+        boundary = end_of_day(day)
+        for chunk in chunked(item_ids.iterator(chunk_size=chunk_size), chunk_size):
+            stocks = dict(InventoryItem.objects.filter(pk__in=chunk).values_list("pk", "stock"))
+            after = _sums_after(chunk, boundary)
+            StockSnapshot.objects.bulk_create(
+                [
+                    StockSnapshot(item_id=pk, date=day, stock=stock - after.get(pk, 0))
+                    for pk, stock in stocks.items()
+                ],
+                update_conflicts=True,
+                unique_fields=["item", "date"],
+                update_fields=["stock"],
+            )
+            written += len(stocks)
+    return written
+
+
+# ---------------------------------------------------------------------------
+# Queries (read)
+# ---------------------------------------------------------------------------
+
+def get_stock_as_of(item_id, day):
+    """
+    Return the stock of ``item_id`` at the end of local date ``day``.
+
+    Uses the nearest snapshot on or before ``day`` plus the ledger delta
+    since then; falls back to the nearest later snapshot (minus the delta)
+    and finally to the current stock minus everything posted after ``day``.
+    """
+    boundary = end_of_day(day)
+
+    before = (
+        StockSnapshot.objects.filter(item_id=item_id, date__lte=day)
+        .order_by("-date")
+        .values_list("date", "stock")
+        .first()
+    )
+    if before:
+        snap_date, stock = before
+        return stock + _ledger_sum(item_id, start=end_of_day(snap_date), end=boundary)
+
+    after = (
+        StockSnapshot.objects.filter(item_id=item_id, date__gt=day)
+        .order_by("date")
+        .values_list("date", "stock")
+        .first()
+    )
+    if after:
+        snap_date, stock = after
+        return stock - _ledger_sum(item_id, start=boundary, end=end_of_day(snap_date))
+
+    current = InventoryItem.objects.values_list("stock", flat=True).get(pk=item_id)
+    return current - _ledger_sum(item_id, start=boundary)
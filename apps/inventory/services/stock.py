@@ -0,0 +1,163 @@
+"""
+Set-based stock posting engine.
+
+Every stock mutation in the services goes through this module. Deltas are
+applied with a conditional ``UPDATE ... SET stock = stock + delta WHERE
+stock + delta >= 0`` (backed by the ``inventoryitem_stock_non_negative``
+CHECK constraint), so no read-modify-write or row lock is needed for a
+single adjustment. Multi-item documents additionally lock their items in
+one query ordered by primary key to keep concurrent postings deadlock-free.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Q, When
+
+from apps.common.cache import bump_version_on_commit, instance_version_name
+
+from ..models.inventory import InventoryItem
+from ..models.transactions import InventoryTxn
+from . import search as search_svc
+from . import snapshots as snapshot_svc
+
+
+class InsufficientStockError(ValueError):
+    """Raised when one or more items cannot cover the requested quantity."""
+
+    def __init__(self, shortages):
+        self.shortages = shortages  # [(item, requested_qty), ...]
+        detail = "; ".join(
+            f"{item.sku} (Disponible: {item.stock}, Solicitado: {qty})"
+            for item, qty in shortages
+        )
+        super().__init__(f"Stock insuficiente para {detail}")
+
+
+class _PartialUpdate(Exception):
+    """Internal: ``apply_stock_deltas`` skipped at least one row."""
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def aggregate_deltas(pairs):
+    """Collapse ``(item_id, qty)`` pairs into ``{item_id: net_qty}``."""
+    deltas = defaultdict(int)
+    for item_id, qty in pairs:
+        deltas[int(item_id)] += qty
+    return dict(deltas)
+
+
+def check_availability(items, requested):
+    """
+    Validate ``{item_id: qty}`` against locked ``items`` in a single pass.
+
+    Raises ``InsufficientStockError`` listing every short item at once.
+    """
+    shortages = [
+        (items[pk], qty)
+        for pk, qty in sorted(requested.items())
+        if items[pk].stock < qty
+    ]
+    if shortages:
+        raise InsufficientStockError(shortages)
+
+
+# ---------------------------------------------------------------------------
+# Commands (write)
+# ---------------------------------------------------------------------------
+
+def lock_items(item_ids):
+    """
+    Lock the given items with one ``SELECT ... FOR UPDATE`` in pk order.
+
+    Locking in a deterministic order is what keeps concurrent documents that
+    share items from deadlocking. Returns ``{pk: item}``; raises
+    ``ValueError`` if any id does not exist. Must run inside
+    ``transaction.atomic()``.
+    """
+    ids = sorted({int(pk) for pk in item_ids})
+    items = {
+        item.pk: item
+        for item in InventoryItem.objects.select_for_update().filter(pk__in=ids).order_by("pk")
+    }
+    missing = [pk for pk in ids if pk not in items]
+    if missing:
+        raise ValueError(f"Producto no encontrado: {', '.join(map(str, missing))}")
+    return items
+
+
+def record_txns(txns):
+    """
+    Insert ledger rows in bulk and keep daily snapshots in sync.
+
+    Every service that writes ``InventoryTxn`` rows goes through here.
+    """
+    txns = InventoryTxn.objects.bulk_create(txns)
+    snapshot_svc.sync_snapshots((t.item_id, t.happened_at, t.qty) for t in txns)
+    return txns
+
+
+def apply_stock_delta(item_id, delta):
+    """
+    Add ``delta`` to one item's stock unless it would go negative.
+
+    Single conditional ``UPDATE``; returns ``True`` if the row changed.
+    """
+    updated = InventoryItem.objects.filter(pk=item_id, stock__gte=-delta).update(
+        stock=F("stock") + delta
+    ) == 1
+    if updated:
+        search_svc.invalidate_scan_cache([item_id])
+        bump_version_on_commit("inventoryitem")
+        bump_version_on_commit(instance_version_name("inventoryitem", item_id))
+    return updated
+
+
+def apply_stock_deltas(deltas):
+    """
+    Apply ``{item_id: delta}`` to ``InventoryItem.stock`` in one ``UPDATE``.
+
+    Each row is only updated if its stock stays non-negative; if any row is
+    skipped the whole update is rolled back and ``InsufficientStockError``
+    is raised. Zero deltas are ignored. Returns the number of rows updated.
+    """
+    deltas = {pk: delta for pk, delta in deltas.items() if delta}
+    if not deltas:
+        return 0
+
+    condition = Q()
+    for pk, delta in deltas.items():
+        condition |= Q(pk=pk, stock__gte=-delta)
+
+    try:
+        with transaction.atomic():
+            updated = InventoryItem.objects.filter(condition).update(
+                stock=Case(
+                    *(When(pk=pk, then=F("stock") + delta) for pk, delta in deltas.items()),
+                    default=F("stock"),
+                    output_field=IntegerField(),
+                )
+            )
+            if updated != len(deltas):
+                # Leaving the atomic block undoes the partial update
+                raise _PartialUpdate
+    except _PartialUpdate:
+        # Read after the rollback: rows that were updated show their
+        # original stock again and are not reported as short
+        items = InventoryItem.objects.in_bulk(deltas.keys())
+        missing = sorted(set(deltas) - set(items))
+        if missing:
+            raise ValueError(f"Producto no encontrado: {', '.join(map(str, missing))}")
+        raise InsufficientStockError([
+            (items[pk], -delta)
+            for pk, delta in sorted(deltas.items())
+            if items[pk].stock + delta < 0
+        ]) from None
+    search_svc.invalidate_scan_cache(deltas.keys())
+    bump_version_on_commit("inventoryitem")
+    for pk in deltas:
+        bump_version_on_commit(instance_version_name("inventoryitem", pk))
+    return updated
@@ -2,9 +2,13 @@
 Business logic for supplier management.
 """
 
+from django.db import transaction
 from django.db.models import Q
 
+from apps.common.utils import normalize_name
+
 from ..models.purchases import Supplier
+from . import purchases as purchase_svc
 
 
 # ---------------------------------------------------------------------------
@@ -27,15 +31,21 @@ def create_supplier(*, name, contact_name="", phone=None, email="", rfc="", addr
 
 
 def update_supplier(supplier, *, name, contact_name="", phone=None, email="", rfc="", address="", active=True):
-    """Update an existing supplier."""
-    supplier.name = name
-    supplier.contact_name = contact_name
-    supplier.phone = phone
-    supplier.email = email
-    supplier.rfc = rfc
-    supplier.address = address
-    supplier.active = active
-    supplier.save()
+    """Update an existing supplier; a rename refreshes its purchases' search text."""
+    with transaction.atomic():
+        renamed = supplier.name != name
+        supplier.name = name
+        supplier.contact_name = contact_name
+        supplier.phone = phone
+        supplier.email = email
+        supplier.rfc = rfc
+        supplier.address = address
+        supplier.active = active
+        supplier.save()
+        if renamed:
+            purchase_svc.refresh_search_text(
+                supplier.purchases.values_list("pk", flat=True).iterator()
+            )
     return supplier
 
 
@@ -48,7 +58,7 @@ def get_supplier_list(*, search="", status=""):
     qs = Supplier.objects.all()
     if search:
         qs = qs.filter(
-            Q(name__icontains=search)
+            Q(normalized_name__contains=normalize_name(search))
             | Q(contact_name__icontains=search)
             | Q(rfc__icontains=search)
             | Q(email__icontains=search)
@@ -0,0 +1,66 @@
+"""
+Signal handlers for the inventory app (connected in ``InventoryConfig.ready``).
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.common.cache import bump_version_on_commit, instance_version_name
+from apps.common.utils import normalize_name
+
+from .models.inventory import Category, InventoryItem, ItemPhoto
+from .models.purchases import Purchase, Supplier
+from .models.transactions import Requisition
+from .services import search as search_svc
+
+
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=Supplier)
+def set_normalized_name(sender, instance, raw=False, **kwargs):
+    # Also runs for raw saves (loaddata), which skip Model.save(). A fixture
+    # that already carries the column keeps it (it may hold a "#pk" suffix).
+    if raw and instance.normalized_name:
+        return
+    instance.normalized_name = normalize_name(instance.name)
+
+
+@receiver(post_save, sender=InventoryItem)
+def index_item_on_save(sender, instance, using, update_fields=None, **kwargs):
+    search_svc.invalidate_scan_cache([instance.pk])
+    if update_fields is not None and not {"sku", "description"} & set(update_fields):
+        return
+    search_svc.index_item(instance, using=using)
+
+
+@receiver(post_delete, sender=InventoryItem)
+def unindex_item_on_delete(sender, instance, using, **kwargs):
+    search_svc.invalidate_scan_cache([instance.pk])
+    search_svc.unindex_item(instance.pk, using=using)
+
+
+@receiver(post_save, sender=InventoryItem)
+@receiver(post_delete, sender=InventoryItem)
+@receiver(post_save, sender=Purchase)
+@receiver(post_delete, sender=Purchase)
+@receiver(post_save, sender=Requisition)
+@receiver(post_delete, sender=Requisition)
+def bump_model_version(sender, using, **kwargs):
+    bump_version_on_commit(sender._meta.model_name, using=using)
+
+
+@receiver(post_save, sender=InventoryItem)
+@receiver(post_delete, sender=InventoryItem)
+def bump_item_row_version(sender, instance, using, **kwargs):
+    bump_version_on_commit(instance_version_name("inventoryitem", instance.pk), using=using)
+
+
+@receiver(post_save, sender=ItemPhoto)
+@receiver(post_delete, sender=ItemPhoto)
+def bump_photo_item_row_version(sender, instance, using, **kwargs):
+    bump_version_on_commit(instance_version_name("inventoryitem", instance.item_id), using=using)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def bump_category_row_version(sender, instance, using, **kwargs):
+    bump_version_on_commit(instance_version_name("category", instance.pk), using=using)
@@ -0,0 +1,123 @@
+"""
+Caché de fragmentos por fila de inventario.
+
+Uso::
+
+    {% load inventory_cache %}
+    {% cached_rows items perms.inventory.change_inventoryitem %}
+    {% for item in items %}
+        {% cached_row item %}<tr>…</tr>{% endcached_row %}
+    {% endfor %}
+    {% endcached_rows %}
+
+``cached_rows`` lee de una vez las versiones ``inventoryitem.<id>`` y
+``category.<id>`` de toda la página (las incrementan las señales y el motor
+de stock) y los fragmentos ya cacheados, con un ``get_many`` cada uno; al
+terminar guarda las filas que faltaban con un solo ``set_many``. La llave
+combina el id del producto, sus versiones, los argumentos extra (p. ej.
+permisos que cambian el HTML) y el bloque de firma de URLs, para no servir
+fotos con tokens vencidos.
+
+Sin caché compartida (``versioned_cache_enabled()`` falso) las filas se
+renderizan siempre.
+"""
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.common import metrics
+from apps.common.cache import (
+    get_versions,
+    instance_version_name,
+    signed_url_bucket,
+    versioned_cache_enabled,
+)
+
+register = template.Library()
+
+_BATCH = "inventory_cache.rows"
+
+
+def _row_names(item):
+    return (
+        instance_version_name("inventoryitem", item.pk),
+        instance_version_name("category", item.category_id),
+    )
+
+
+class CachedRowsNode(template.Node):
+    def __init__(self, nodelist, items, extra):
+        self.nodelist = nodelist
+        self.items = items
+        self.extra = extra
+
+    def render(self, context):
+        if not versioned_cache_enabled():
+            return self.nodelist.render(context)
+
+        items = list(self.items.resolve(context) or [])
+        versions = get_versions([name for item in items for name in _row_names(item)])
+        extra = ":".join(str(var.resolve(context)) for var in self.extra)
+        bucket = signed_url_bucket()
+        keys = {}
+        for item in items:
+            item_version, category_version = (versions[name] for name in _row_names(item))
+            keys[item.pk] = (
+                f"inventory_row:{item.pk}:{item_version}:{category_version}:{extra}:{bucket}"
+            )
+
+        batch = {"keys": keys, "found": cache.get_many(keys.values()), "missed": {}}
+        context.render_context[_BATCH] = batch
+        try:
+            html = self.nodelist.render(context)
+        finally:
+            del context.render_context[_BATCH]
+        if batch["missed"]:
+            cache.set_many(batch["missed"], getattr(settings, "INVENTORY_ROW_CACHE_TTL", 3600))
+        return html
+
+
+class CachedRowNode(template.Node):
+    def __init__(self, nodelist, item):
+        self.nodelist = nodelist
+        self.item = item
+
+    def render(self, context):
+        batch = context.render_context.get(_BATCH)
+        key = batch and batch["keys"].get(self.item.resolve(context).pk)
+        if key is None:
+            return self.nodelist.render(context)
+
+        html = batch["found"].get(key)
+        if html is not None:
+            metrics.incr("inventory_row.hit")
+            return html
+
+        metrics.incr("inventory_row.miss")
+        html = self.nodelist.render(context)
+        batch["missed"][key] = html
+        return html
+
+
+@register.tag
+def cached_rows(parser, token):
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' requiere los productos como argumento")
+    nodelist = parser.parse(("endcached_rows",))
+    parser.delete_first_token()
+    return CachedRowsNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        [parser.compile_filter(bit) for bit in bits[2:]],
+    )
+
+
+@register.tag
+def cached_row(parser, token):
+    bits = token.split_contents()
+    if len(bits) != 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' requiere solo el producto como argumento")
+    nodelist = parser.parse(("endcached_row",))
+    parser.delete_first_token()
+    return CachedRowNode(nodelist, parser.compile_filter(bits[1]))
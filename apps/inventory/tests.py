@@ -1,3 +1,240 @@
-from django.test import TestCase
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import transaction
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import Category, InventoryItem, InventoryTxn, PurchasePhoto, Supplier
+from .services import inventory as inventory_svc
+from .services import purchases as purchase_svc
+from .services import reconciliation as reconciliation_svc
+from .services import search as search_svc
+from .services import snapshots as snapshot_svc
+from .services import stock as stock_svc
+
+
+def make_item(sku, *, stock=10, category=None):
+    category = category or Category.objects.get_or_create(name="General")[0]
+    return InventoryItem.objects.create(
+        sku=sku, slug=sku.lower(), category=category, description=f"Producto {sku}",
+        stock=stock, min_stock=2, max_stock=100,
+    )
+
+
+def line(item, qty, price="1.00"):
+    return {"item": str(item.pk), "qty": str(qty), "unit_price": price}
+
+
+class ApplyStockDeltasTests(TestCase):
+    def setUp(self):
+        self.a = make_item("A")
+        self.b = make_item("B")
+
+    def stocks(self):
+        return list(InventoryItem.objects.order_by("pk").values_list("stock", flat=True))
+
+    def test_applies_all_deltas(self):
+        self.assertEqual(stock_svc.apply_stock_deltas({self.a.pk: -4, self.b.pk: 5}), 2)
+        self.assertEqual(self.stocks(), [6, 15])
+
+    def test_rolls_back_and_reports_only_short_items(self):
+        with self.assertRaises(stock_svc.InsufficientStockError) as ctx:
+            stock_svc.apply_stock_deltas({self.a.pk: -6, self.b.pk: -20})
+        self.assertEqual(self.stocks(), [10, 10])
+        shortages = ctx.exception.shortages
+        self.assertEqual([(item.pk, item.stock, qty) for item, qty in shortages], [(self.b.pk, 10, 20)])
+        self.assertNotIn("A (", str(ctx.exception))
+
+    def test_single_delta_is_conditional(self):
+        self.assertFalse(stock_svc.apply_stock_delta(self.a.pk, -11))
+        self.assertTrue(stock_svc.apply_stock_delta(self.a.pk, -10))
+        self.assertEqual(self.stocks(), [0, 10])
+
+
+class PurchasePostingTests(TestCase):
+    def setUp(self):
+        self.supplier = Supplier.objects.create(name="Proveedor")
+        self.a = make_item("A", stock=0)
+        self.b = make_item("B", stock=0)
+
+    def create(self, *lines):
+        return purchase_svc.create_purchase(
+            supplier_id=self.supplier.pk, purchased_at="2026-01-15", ref="F-1",
+            lines_data={str(i): ld for i, ld in enumerate(lines)},
+        )
+
+    def assertLedgerMatchesStock(self):
+        for item in InventoryItem.objects.all():
+            total = sum(item.txns.values_list("qty", flat=True))
+            self.assertEqual(item.stock, total, item.sku)
+
+    def test_create_posts_stock_and_ledger(self):
+        purchase = self.create(line(self.a, 3, "2.50"), line(self.b, 2), line(self.a, 1, "2.50"))
+        self.a.refresh_from_db()
+        self.b.refresh_from_db()
+        self.assertEqual((self.a.stock, self.b.stock), (4, 2))
+        self.assertEqual(purchase.total, 12)
+        self.assertEqual(InventoryTxn.objects.filter(purchase=purchase).count(), 3)
+        self.assertLedgerMatchesStock()
+
+    def test_update_applies_only_the_difference(self):
+        purchase = self.create(line(self.a, 5), line(self.b, 2))
+        purchase_svc.update_purchase(
+            purchase, supplier_id=self.supplier.pk, purchased_at="2026-01-15", ref="F-1",
+            lines_data={"0": line(self.a, 3)},
+        )
+        self.a.refresh_from_db()
+        self.b.refresh_from_db()
+        self.assertEqual((self.a.stock, self.b.stock), (3, 0))
+        self.assertLedgerMatchesStock()
+
+    def test_photos_upload_outside_transaction_and_clean_up_on_failure(self):
+        purchase = self.create(line(self.a, 5))
+        stock_svc.apply_stock_delta(self.a.pk, -4)  # ya no se puede quitar la línea
+        conn = transaction.get_connection()  # las subidas corren en otros hilos
+        depth = len(conn.savepoint_ids)
+        saved, save = [], default_storage.save
+
+        def spy(name, content, max_length=None):
+            saved.append((len(conn.savepoint_ids), save(name, content, max_length)))
+            return saved[-1][1]
+
+        with tempfile.TemporaryDirectory() as tmp, self.settings(MEDIA_ROOT=tmp), \
+                mock.patch.object(default_storage, "save", side_effect=spy):
+            with self.assertRaises(stock_svc.InsufficientStockError):
+                purchase_svc.update_purchase(
+                    purchase, supplier_id=self.supplier.pk, purchased_at="2026-01-15", ref="F-1",
+                    lines_data={"0": line(self.b, 1)}, photos=[SimpleUploadedFile("f.png", b"x")],
+                )
+            self.assertEqual([d for d, _ in saved], [depth])  # antes de abrir el atomic
+            self.assertFalse(default_storage.exists(saved[0][1]))
+        self.assertFalse(PurchasePhoto.objects.exists())
+
+    def test_delete_refuses_when_stock_was_consumed(self):
+        purchase = self.create(line(self.a, 5), line(self.b, 5))
+        stock_svc.apply_stock_delta(self.b.pk, -4)
+        with self.assertRaises(stock_svc.InsufficientStockError) as ctx:
+            purchase_svc.delete_purchase(purchase)
+        self.assertEqual([item.pk for item, _ in ctx.exception.shortages], [self.b.pk])
+        self.a.refresh_from_db()
+        self.assertEqual(self.a.stock, 5)
+
+
+class ReconcileStockTests(TestCase):
+    def test_fix_keeps_point_in_time_stock(self):
+        item = make_item("A", stock=0)
+        inventory_svc.adjust_stock(item, qty=10)
+        InventoryItem.objects.filter(pk=item.pk).update(stock=108)  # drift
+        today = timezone.localdate()
+        yesterday = today - timedelta(days=1)
+        call_command("snapshot_stock", until=str(yesterday), stdout=StringIO())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            call_command(
+                "reconcile_stock", fix=True, output=str(Path(tmp) / "drift.csv"), stdout=StringIO()
+            )
+
+        self.assertEqual(sum(item.txns.values_list("qty", flat=True)), 108)
+        self.assertEqual(snapshot_svc.get_stock_as_of(item.pk, today), 108)
+        self.assertEqual(snapshot_svc.get_stock_as_of(item.pk, yesterday), 0)
+
+    def test_fix_rechecks_drift_under_lock(self):
+        item = make_item("A", stock=0)
+        inventory_svc.adjust_stock(item, qty=10)
+        InventoryItem.objects.filter(pk=item.pk).update(stock=15)
+        drifts = list(reconciliation_svc.iter_drift())
+        self.assertEqual(drifts, [(item.pk, "A", 15, 10)])
+        # A document lands between the scan and --fix and explains the drift
+        InventoryTxn.objects.create(
+            item=item, txn_type=InventoryTxn.TXN_ADJUST, qty=5, happened_at=timezone.now()
+        )
+
+        self.assertEqual(reconciliation_svc.post_corrections(drifts), 0)
+        self.assertEqual(sum(item.txns.values_list("qty", flat=True)), 15)
+
+
+class SearchItemsTests(TestCase):
+    def test_matches_substrings_like_icontains(self):
+        alpha = make_item("ALP-100")
+        alpha.description = "Lámina alpha galvanizada"
+        alpha.save()
+        make_item("BET-200")
+
+        def found(q):
+            return list(search_svc.search_items(InventoryItem.objects.all(), q).values_list("sku", flat=True))
+
+        self.assertEqual(found("lpha"), ["ALP-100"])
+        self.assertEqual(found("P-1"), ["ALP-100"])
+        self.assertEqual(found("alpha galv"), ["ALP-100"])
+        self.assertEqual(found("T-"), ["BET-200"])
+        self.assertEqual(found("zeta"), [])
+
+
+class NormalizedNameTests(TestCase):
+    def test_loaddata_fills_normalized_name(self):
+        fixture = [
+            {"model": "inventory.category", "pk": 1, "fields": {"name": "Herrería", "active": True,
+             "created_at": "2025-01-01T00:00:00Z", "updated_at": "2025-01-01T00:00:00Z"}},
+            {"model": "inventory.category", "pk": 2, "fields": {"name": "Láminas", "active": True,
+             "created_at": "2025-01-01T00:00:00Z", "updated_at": "2025-01-01T00:00:00Z"}},
+            {"model": "inventory.supplier", "pk": 1, "fields": {"name": "Aceros Del Norte",
+             "created_at": "2025-01-01T00:00:00Z", "updated_at": "2025-01-01T00:00:00Z"}},
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "fixture.json"
+            path.write_text(json.dumps(fixture), encoding="utf-8")
+            call_command("loaddata", str(path), stdout=StringIO())
+
+        self.assertEqual(
+            list(Category.objects.order_by("pk").values_list("normalized_name", flat=True)),
+            ["herreria", "laminas"],
+        )
+        self.assertEqual(Supplier.objects.get().normalized_name, "aceros del norte")
+
+
+@override_settings(VERSIONED_CACHE=True)
+class CachedRowsTests(TestCase):
+    template = Template(
+        "{% load inventory_cache %}{% cached_rows items %}{% for item in items %}"
+        "{% cached_row item %}{{ item.sku }}={{ item.stock }};{% endcached_row %}"
+        "{% endfor %}{% endcached_rows %}"
+    )
+
+    def setUp(self):
+        cache.clear()
+        self.a = make_item("A")
+        self.b = make_item("B")
+
+    def render(self):
+        items = list(InventoryItem.objects.order_by("pk"))
+        with mock.patch.object(cache, "get_many", wraps=cache.get_many) as get_many:
+            html = self.template.render(Context({"items": items}))
+        # Versiones y fragmentos de toda la página: una lectura cada uno
+        self.assertEqual(get_many.call_count, 2)
+        return html
+
+    def test_reads_page_in_batch_and_follows_versions(self):
+        self.assertEqual(self.render(), "A=10;B=10;")
+        InventoryItem.objects.filter(pk=self.a.pk).update(stock=7)
+        self.assertEqual(self.render(), "A=10;B=10;")  # sin bump sigue en caché
+
+        with self.captureOnCommitCallbacks(execute=True):
+            stock_svc.apply_stock_delta(self.a.pk, -1)
+        self.assertEqual(self.render(), "A=6;B=10;")
+
+    @override_settings(VERSIONED_CACHE=False)
+    def test_disabled_renders_without_cache(self):
+        with mock.patch.object(cache, "get_many") as get_many:
+            html = self.template.render(Context({"items": [self.a, self.b]}))
+        self.assertEqual(html, "A=10;B=10;")
+        get_many.assert_not_called()
@@ -7,6 +7,8 @@ urlpatterns = [
     
     # Inventario
     path("inventario/", views.inventory_list, name="inventory_list"),
+    path("inventario/buscar/", views.inventory_lookup, name="inventory_lookup"),
+    path("inventario/escanear/", views.inventory_scan, name="inventory_scan"),
     path("inventario/nuevo/", views.inventory_create, name="inventory_create"),
     path("inventario/<int:pk>/editar/", views.inventory_update, name="inventory_update"),
     path("inventario/<int:pk>/ajustar/", views.inventory_adjust, name="inventory_adjust"),
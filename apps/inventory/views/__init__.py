@@ -6,6 +6,8 @@ from .inventory import (  # noqa: F401
     inventory_adjust,
     inventory_print_label,
     inventory_print_labels,
+    inventory_lookup,
+    inventory_scan,
 )
 from .purchases import (  # noqa: F401
     purchase_list,
@@ -4,7 +4,8 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib import messages
 from django.core.exceptions import ValidationError
-from django.core.paginator import Paginator
+
+from apps.common.pagination import CachedCountPaginator
 
 from ..models.inventory import Category
 from ..services import categories as category_svc
@@ -25,7 +26,7 @@ def category_list(request):
     except ValueError:
         per_page = 10
 
-    paginator = Paginator(categories, per_page)
+    paginator = CachedCountPaginator(categories, per_page)
     page_obj = paginator.get_page(request.GET.get("page", 1))
 
     context = {"page_obj": page_obj, "per_page": per_page, "search": search}
@@ -2,18 +2,15 @@
 
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
 
-from ..models.inventory import InventoryItem
+from apps.common.pagination import KeysetPaginator
+
 from ..services import dashboard as dashboard_svc
 
 
 @login_required
 def dashboard(request):
     """Dashboard principal con estadísticas."""
-    stats = dashboard_svc.get_stats(request.user)
-    low_stock_items = dashboard_svc.get_low_stock_items(request.user)
-
     # Transactions with filters & pagination
     item_filter = request.GET.get("item", "")
     date_from = request.GET.get("date_from", "")
@@ -24,25 +21,23 @@ def dashboard(request):
         txn_qs, item_filter=item_filter, date_from=date_from, date_to=date_to,
     )
 
-    paginator = Paginator(txn_qs, 10)
-    recent_transactions = paginator.get_page(request.GET.get("page", 1))
-
-    all_items = (
-        InventoryItem.objects.filter(active=True)
-        .values("id", "sku", "description")
-        .order_by("sku")
+    # Keyset pagination on (happened_at, id): no COUNT(*) and no OFFSET
+    paginator = KeysetPaginator(txn_qs, 10, ordering=("-happened_at", "-id"))
+    recent_transactions = paginator.get_page(
+        request.GET.get("cursor", ""), request.GET.get("dir", "next"),
     )
 
     context = {
-        "stats": stats,
-        "low_stock_items": low_stock_items,
         "recent_transactions": recent_transactions,
-        "all_items": all_items,
         "item_filter": item_filter,
         "date_from": date_from,
         "date_to": date_to,
     }
 
+    # HTMX solo re-renderiza la tabla: no se calculan estadísticas ni stock bajo
     if request.headers.get("HX-Request"):
         return render(request, "inventory/partials/transactions_table.html", context)
+
+    context["stats"] = dashboard_svc.get_stats(request.user)
+    context["low_stock_items"] = dashboard_svc.get_low_stock_items(request.user)
     return render(request, "dashboard.html", context)
@@ -3,10 +3,15 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib import messages
-from django.core.paginator import Paginator
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
+from django.views.decorators.cache import cache_control, never_cache
+
+from apps.common.pagination import CachedCountPaginator
 
 from ..models.inventory import Category, InventoryItem
 from ..services import inventory as inventory_svc
+from ..services import search as search_svc
 
 
 @login_required
@@ -26,7 +31,7 @@ def inventory_list(request):
     except (ValueError, TypeError):
         per_page_int = 10
 
-    paginator = Paginator(items, per_page_int)
+    paginator = CachedCountPaginator(items, per_page_int)
     items_page = paginator.get_page(request.GET.get("page", 1))
 
     context = {
@@ -42,6 +47,40 @@ def inventory_list(request):
     return render(request, "inventory/list.html", context)
 
 
+LOOKUP_PERMS = (
+    "inventory.view_inventoryitem",
+    "inventory.add_purchase",
+    "inventory.change_purchase",
+    "inventory.add_requisition",
+)
+
+
+@login_required
+@cache_control(private=True, max_age=60)
+def inventory_lookup(request):
+    """Búsqueda de productos para los selectores (JSON, ``?q=&limit=``)."""
+    if not any(request.user.has_perm(perm) for perm in LOOKUP_PERMS):
+        raise PermissionDenied
+    try:
+        limit = min(max(int(request.GET.get("limit", 20)), 1), 50)
+    except ValueError:
+        limit = 20
+    results = inventory_svc.lookup_items(q=request.GET.get("q", ""), limit=limit)
+    return JsonResponse({"results": results})
+
+
+@login_required
+@never_cache
+def inventory_scan(request):
+    """Producto por SKU exacto para lectores de código de barras (JSON, ``?sku=``)."""
+    if not any(request.user.has_perm(perm) for perm in LOOKUP_PERMS):
+        raise PermissionDenied
+    item = search_svc.get_item_by_sku(request.GET.get("sku", ""))
+    if item is None:
+        return JsonResponse({"error": "Producto no encontrado"}, status=404)
+    return JsonResponse(item)
+
+
 @login_required
 @permission_required("inventory.add_inventoryitem", raise_exception=True)
 def inventory_create(request):
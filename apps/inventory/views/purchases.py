@@ -5,10 +5,9 @@ import json
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib import messages
-from django.db.models import Q
-from django.core.paginator import Paginator
 
-from ..models.inventory import InventoryItem
+from apps.common.pagination import CachedCountPaginator
+
 from ..models.purchases import Supplier, Purchase
 from ..services import purchases as purchase_svc
 
@@ -17,11 +16,8 @@ from ..services import purchases as purchase_svc
 @permission_required("inventory.view_purchase", raise_exception=True)
 def purchase_list(request):
     """Lista de compras con filtros y paginación."""
-    purchases = (
-        Purchase.objects.select_related("supplier")
-        .prefetch_related("lines")
-        .order_by("-purchased_at")
-    )
+    # ``total`` is a stored column, so only the visible page is fetched
+    purchases = Purchase.objects.select_related("supplier").order_by("-purchased_at", "-pk")
 
     supplier_id = request.GET.get("supplier", "")
     if supplier_id:
@@ -40,15 +36,7 @@ def purchase_list(request):
 
     q = request.GET.get("q", "")
     if q:
-        purchases = purchases.filter(
-            Q(ref__icontains=q)
-            | Q(supplier__name__icontains=q)
-            | Q(lines__item__description__icontains=q)
-            | Q(lines__item__sku__icontains=q)
-        ).distinct()
-
-    for p in purchases:
-        p.total = sum(line.qty * line.unit_price for line in p.lines.all())
+        purchases = purchase_svc.filter_purchases(purchases, q=q)
 
     per_page = request.GET.get("per_page", "10")
     try:
@@ -58,7 +46,7 @@ def purchase_list(request):
     except ValueError:
         per_page = 10
 
-    paginator = Paginator(purchases, per_page)
+    paginator = CachedCountPaginator(purchases, per_page)
     page_obj = paginator.get_page(request.GET.get("page", 1))
 
     context = {
@@ -98,7 +86,6 @@ def purchase_create(request):
 
     context = {
         "suppliers": Supplier.objects.all(),
-        "items": InventoryItem.objects.filter(active=True).order_by("sku"),
     }
     return render(request, "purchases/create.html", context)
 
@@ -115,7 +102,7 @@ def purchase_detail(request, pk):
 @login_required
 @permission_required("inventory.change_purchase", raise_exception=True)
 def purchase_update(request, pk):
-    """Editar compra existente — revierte transacciones originales y aplica las nuevas."""
+    """Editar compra existente — solo ajusta el stock de las líneas que cambiaron."""
     purchase = get_object_or_404(Purchase, pk=pk)
 
     if request.method == "POST":
@@ -138,7 +125,6 @@ def purchase_update(request, pk):
         "title": f"Editar Compra #{purchase.id}",
         "purchase": purchase,
         "suppliers": Supplier.objects.filter(active=True).order_by("name"),
-        "items": InventoryItem.objects.filter(active=True).order_by("sku"),
         "existing_lines": purchase_svc.get_purchase_edit_context(purchase),
         "photos": purchase.photos.all(),
         "is_edit": True,
@@ -4,9 +4,9 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib import messages
 from django.core.exceptions import PermissionDenied
-from django.core.paginator import Paginator
 
-from ..models.inventory import InventoryItem
+from apps.common.pagination import CachedCountPaginator
+
 from ..models.transactions import Requisition
 from ..services.purchases import parse_form_lines
 from ..services import requisitions as requisition_svc
@@ -37,7 +37,7 @@ def requisition_list(request):
     except ValueError:
         per_page = 10
 
-    paginator = Paginator(requisitions, per_page)
+    paginator = CachedCountPaginator(requisitions, per_page)
     page_obj = paginator.get_page(request.GET.get("page", 1))
 
     solicitantes = None
@@ -80,8 +80,7 @@ def requisition_create(request):
         except Exception as e:
             messages.error(request, f"Error al crear requisición: {e}")
 
-    context = {"items": InventoryItem.objects.filter(active=True).order_by("sku")}
-    return render(request, "requisitions/create.html", context)
+    return render(request, "requisitions/create.html")
 
 
 @login_required
@@ -4,9 +4,10 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib import messages
 from django.core.exceptions import ValidationError
-from django.core.paginator import Paginator
 from django.http import JsonResponse
 
+from apps.common.pagination import CachedCountPaginator
+
 from ..models.purchases import Supplier
 from ..services import suppliers as supplier_svc
 
@@ -27,7 +28,7 @@ def supplier_list(request):
     except ValueError:
         per_page = 10
 
-    paginator = Paginator(suppliers, per_page)
+    paginator = CachedCountPaginator(suppliers, per_page)
     page_obj = paginator.get_page(request.GET.get("page", 1))
 
     context = {
@@ -5,7 +5,7 @@ from django.contrib.auth.decorators import login_required, permission_required
 from django.db import transaction
 from django.db import models
 from django.utils import timezone
-from django.core.paginator import Paginator
+from apps.common.pagination import CachedCountPaginator
 from .models import Employee
 from .utils import send_activation_email
 
@@ -157,7 +157,7 @@ def employee_list(request):
     except ValueError:
         per_page = 10
     
-    paginator = Paginator(employees, per_page)
+    paginator = CachedCountPaginator(employees, per_page)
     page_number = request.GET.get('page', 1)
     page_obj = paginator.get_page(page_number)
     
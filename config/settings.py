@@ -111,6 +111,15 @@ else:
         }
     }
 
+# Cache
+# La caché de filas del inventario y la de estadísticas del dashboard
+# (apps.common.cache) solo se activan con un backend compartido en memoria
+# (Redis o Memcached, vía CACHE_URL, p. ej. redis://redis:6379/1; requiere el
+# paquete redis). Con la memoria local por defecto se desactivan: cada worker
+# vería versiones distintas. VERSIONED_CACHE=True las fuerza (un solo proceso).
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+VERSIONED_CACHE = env.bool("VERSIONED_CACHE", default=None)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -161,6 +170,23 @@ if USE_BUNNY_STORAGE:
     BUNNY_TOKEN_EXPIRATION = env.int("BUNNY_TOKEN_EXPIRATION", default=604800)
     BUNNY_CDN_URL = env("MEDIA_URL", default="https://disitech.b-cdn.net/")
     BUNNY_REGION = env("BUNNY_REGION", default="")
+    # URLs firmadas memoizadas por (url, bloque de expiración)
+    BUNNY_SIGNED_URL_CACHE_SIZE = env.int("BUNNY_SIGNED_URL_CACHE_SIZE", default=8192)
+    # Session HTTP por proceso: pool de conexiones, reintentos (GET/HEAD/DELETE)
+    # y timeouts de lectura por operación (upload/download/metadata/delete/list)
+    BUNNY_POOL_MAXSIZE = env.int("BUNNY_POOL_MAXSIZE", default=10)
+    BUNNY_MAX_RETRIES = env.int("BUNNY_MAX_RETRIES", default=3)
+    BUNNY_RETRY_BACKOFF = env.float("BUNNY_RETRY_BACKOFF", default=0.3)
+    BUNNY_CONNECT_TIMEOUT = env.float("BUNNY_CONNECT_TIMEOUT", default=5)
+    # Enviar el header Checksum (SHA-256) en cada subida; cuesta una lectura extra
+    BUNNY_UPLOAD_CHECKSUM = env.bool("BUNNY_UPLOAD_CHECKSUM", default=False)
+    # Caché local de lectura para storage.open() (vacío = desactivada)
+    BUNNY_CACHE_DIR = env("BUNNY_CACHE_DIR", default="")
+    BUNNY_CACHE_MAX_BYTES = env.int("BUNNY_CACHE_MAX_BYTES", default=512 * 1024 * 1024)
+    BUNNY_CACHE_REVALIDATE = env.bool("BUNNY_CACHE_REVALIDATE", default=False)
+    # Caché de exists()/size() por nombre de objeto
+    BUNNY_METADATA_CACHE_SIZE = env.int("BUNNY_METADATA_CACHE_SIZE", default=4096)
+    BUNNY_METADATA_CACHE_TTL = env.int("BUNNY_METADATA_CACHE_TTL", default=300)
     STORAGES = {
         "default": {
             "BACKEND": "apps.common.storage.BunnyStorage",
@@ -182,11 +208,34 @@ else:
     MEDIA_URL = "media/"
     MEDIA_ROOT = BASE_DIR / "media"
 
+# Subidas de fotos en paralelo por producto/compra (hilos por petición)
+PHOTO_UPLOAD_WORKERS = env.int("PHOTO_UPLOAD_WORKERS", default=4)
+
 # Login/Logout URLs
 LOGIN_URL = "login"
 LOGIN_REDIRECT_URL = "dashboard"
 LOGOUT_REDIRECT_URL = "login"
 
+# Paginación: caché del COUNT(*) por filtro y umbral para usar el estimado
+# del planner de PostgreSQL en lugar del conteo exacto.
+PAGINATION_COUNT_TTL = env.int("PAGINATION_COUNT_TTL", default=60)
+PAGINATION_ESTIMATE_THRESHOLD = env.int("PAGINATION_ESTIMATE_THRESHOLD", default=100_000)
+
+# Escaneo de códigos de barras: caché LRU por proceso (SKU -> producto/stock).
+# El TTL acota cuánto puede ver un worker un stock cambiado por otro proceso.
+SCAN_CACHE_SIZE = env.int("SCAN_CACHE_SIZE", default=1024)
+SCAN_CACHE_TTL = env.int("SCAN_CACHE_TTL", default=5)
+
+# Estadísticas del dashboard: se invalidan por versión al cambiar los datos
+DASHBOARD_STATS_TTL = env.int("DASHBOARD_STATS_TTL", default=300)
+
+# Filas de la tabla de inventario cacheadas por versión de producto/categoría
+INVENTORY_ROW_CACHE_TTL = env.int("INVENTORY_ROW_CACHE_TTL", default=3600)
+
+# URL del logo cacheada por proceso; los demás workers ven un logo nuevo
+# a más tardar en LOGO_CACHE_TTL segundos.
+LOGO_CACHE_TTL = env.int("LOGO_CACHE_TTL", default=60)
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
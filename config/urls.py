@@ -21,6 +21,8 @@ from django.contrib.auth import views as auth_views
 from django.conf import settings
 from django.conf.urls.static import static
 
+from apps.common import views as common_views
+
 # Handler para errores 403 (sin permisos)
 handler403 = 'django.views.defaults.permission_denied'
 
@@ -30,6 +32,7 @@ urlpatterns = [
     path("login/", auth_views.LoginView.as_view(template_name="login.html"), name="login"),
     path("logout/", auth_views.LogoutView.as_view(), name="logout"),
     path("profiles/", include("apps.profiles.urls")),
+    path("metricas/", common_views.metrics, name="metrics"),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,130 @@
+/**
+ * item_lookup.js — Selector de productos con búsqueda bajo demanda
+ * Consulta el endpoint JSON de inventario (?q=&limit=) en lugar de
+ * renderizar todo el catálogo dentro de cada <select>.
+ *
+ * Uso:
+ *   <select name="lines[0][item]" class="form-select" required
+ *           data-item-lookup="{% url 'inventory_lookup' %}"
+ *           data-lookup-stock>  <!-- opcional: muestra stock y data-stock -->
+ *     <option value="">Seleccione un producto</option>
+ *   </select>
+ *
+ * Los selects presentes al cargar se inicializan solos; para líneas
+ * agregadas dinámicamente llamar ItemLookup.attach(contenedor).
+ */
+(function () {
+  'use strict';
+
+  const LIMIT = 20;
+  const DEBOUNCE_MS = 200;
+  const responses = new Map();   // url -> Promise<results>, compartido por todos los selects
+
+  function fetchResults(url) {
+    if (!responses.has(url)) {
+      const request = fetch(url, { headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+        .then(function (r) {
+          if (!r.ok) throw new Error(r.status);
+          return r.json();
+        })
+        .then(function (data) { return data.results; });
+      request.catch(function () { responses.delete(url); });
+      responses.set(url, request);
+    }
+    return responses.get(url);
+  }
+
+  class ItemLookup {
+    constructor(select) {
+      this.select = select;
+      this.url = select.dataset.itemLookup;
+      this.showStock = 'lookupStock' in select.dataset;
+      this.timer = null;
+      this.seq = 0;
+      this.loaded = false;
+      select.dataset.lookupReady = '1';
+      this.render();
+      this.bind();
+    }
+
+    render() {
+      this.input = document.createElement('input');
+      this.input.type = 'search';
+      this.input.className = 'form-control form-control-sm mb-1';
+      this.input.placeholder = 'Buscar por SKU o descripción…';
+      this.input.autocomplete = 'off';
+      this.select.before(this.input);
+    }
+
+    bind() {
+      this.input.addEventListener('input', () => {
+        clearTimeout(this.timer);
+        this.timer = setTimeout(() => this.load(this.input.value.trim()), DEBOUNCE_MS);
+      });
+      this.input.addEventListener('keydown', (e) => {
+        if (e.key === 'Enter') {
+          e.preventDefault();   // no enviar el formulario al escanear un código
+          clearTimeout(this.timer);
+          this.load(this.input.value.trim());
+        }
+      });
+      this.select.addEventListener('focus', () => {
+        if (!this.loaded) this.load(this.input.value.trim());
+      });
+    }
+
+    label(item) {
+      const text = item.sku + ' - ' + item.description;
+      return this.showStock ? text + ' (Stock: ' + item.stock + ')' : text;
+    }
+
+    load(q) {
+      const seq = ++this.seq;
+      const params = new URLSearchParams({ q: q, limit: LIMIT });
+      fetchResults(this.url + '?' + params.toString())
+        .then((results) => {
+          if (seq !== this.seq) return;   // llegó una respuesta más nueva
+          this.loaded = true;
+          this.fill(results, q);
+        })
+        .catch(() => {});
+    }
+
+    fill(results, q) {
+      const select = this.select;
+      const current = select.value ? select.options[select.selectedIndex] : null;
+      const placeholder = select.options[0] && !select.options[0].value
+        ? select.options[0]
+        : new Option('Seleccione un producto', '');
+
+      select.replaceChildren(placeholder);
+      if (current && !results.some((item) => String(item.id) === current.value)) {
+        select.add(current);
+      }
+      results.forEach((item) => {
+        const option = new Option(this.label(item), item.id);
+        option.dataset.stock = item.stock;
+        select.add(option);
+      });
+
+      if (current) {
+        select.value = current.value;
+      } else if (q && results.length === 1) {
+        select.value = String(results[0].id);
+        select.dispatchEvent(new Event('change', { bubbles: true }));
+      }
+    }
+  }
+
+  window.ItemLookup = {
+    attach: function (root) {
+      (root || document).querySelectorAll('select[data-item-lookup]:not([data-lookup-ready])')
+        .forEach(function (el) { new ItemLookup(el); });
+    },
+  };
+
+  // Auto-inicializar en DOMContentLoaded
+  document.addEventListener('DOMContentLoaded', function () {
+    window.ItemLookup.attach(document);
+  });
+})();